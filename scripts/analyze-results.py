@@ -12,11 +12,176 @@ USAGE:
     python scripts/analyze-results.py scripts/optimization-results-p345-*.json
 """
 
+from __future__ import annotations
+
 import json
+import mmap
 import sys
-import argparse
+from dataclasses import dataclass
+from itertools import chain
+from operator import attrgetter, itemgetter
 from pathlib import Path
-import glob
+
+# orjson parses large result files 2-5x faster than stdlib json (SIMD tokenizer).
+# Fall back to stdlib if it's not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson lets us stream huge concatenated result files one pattern-size list
+# at a time instead of holding the raw bytes and the parse tree at once.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Above this file size, prefer streaming over a whole-file parse
+STREAM_THRESHOLD = 64 * 1024 * 1024
+
+# Below this file size, stdlib json is fast enough that orjson isn't worth it
+SMALL_FILE_THRESHOLD = 1_000_000
+
+# NumPy's import alone (~80ms, more with numba) dwarfs the analysis of a
+# small interactive sweep, so the heavy imports are deferred until a result
+# set actually crosses this row count; smaller sets take plain-Python paths.
+NUMPY_MIN_ROWS = 200
+
+np = None
+_groupby_mean = None
+
+def _ensure_numpy():
+    """Import NumPy on first use and build the groupby kernel.
+
+    Numba turns the kernel into a native loop; without it the NumPy
+    bincount implementation is used instead.
+    """
+    global np, _groupby_mean
+    if np is not None:
+        return np
+    import numpy
+    np = numpy
+
+    try:
+        from numba import njit
+
+        @njit(cache=True)
+        def _groupby_mean_jit(inv, rates, n_groups):
+            """Per-group sums and counts in one native pass"""
+            sums = numpy.zeros(n_groups, dtype=numpy.float64)
+            counts = numpy.zeros(n_groups, dtype=numpy.int64)
+            for i in range(inv.shape[0]):
+                g = inv[i]
+                sums[g] += rates[i]
+                counts[g] += 1
+            return sums, counts
+
+        _groupby_mean = _groupby_mean_jit
+    except ImportError:
+        def _groupby_mean_np(inv, rates, n_groups):
+            """Per-group sums and counts via bincount (no-numba fallback)"""
+            sums = numpy.bincount(inv, weights=rates, minlength=n_groups)
+            counts = numpy.bincount(inv, minlength=n_groups)
+            return sums, counts
+
+        _groupby_mean = _groupby_mean_np
+    return np
+
+# C-level key callables: no Python frame per comparison during sorts
+_BY_SUCCESS = itemgetter('success_rate')
+_BY_PREDS = attrgetter('avg_predictions_per_point')
+
+# Bound format_map method: the template is parsed once at import instead of
+# re-tokenizing an f-string with four dict subscripts on every report line
+_PARAMS_FMT = "   Settings: sample_size={sample_size}, min_hits={min_hits}, max_hits={max_hits}, not_hit_in={not_hit_in}".format_map
+
+# Comparison-table row template, parsed once instead of per row
+_COMPARE_ROW = "{:<6} {:<12.2f} {:<12.1f} {:<15.1f} {:<15.2f} {}".format
+
+@dataclass(slots=True)
+class Record:
+    """One optimization result row.
+
+    Every record has the same shape, so slots give fixed-offset attribute
+    access in the hot loops instead of repeated dict hashing.
+    """
+    pattern_size: int
+    success_rate: float
+    avg_rounds_to_hit: float
+    avg_predictions_per_point: float
+    balance_score: float
+    maintaining_rate: float
+    avg_profit: float
+    total_successes: int
+    total_predictions: int
+    params: dict
+
+@dataclass(slots=True)
+class Columns:
+    """Struct-of-arrays view over one pattern size's records.
+
+    The numeric fields live in packed float64/int32 arrays (8 bytes per value
+    instead of a boxed Python float per dict slot), and every analyzer reads
+    the same arrays instead of re-extracting its own.
+    """
+    success_rate: np.ndarray
+    avg_rounds_to_hit: np.ndarray
+    avg_predictions_per_point: np.ndarray
+    balance_score: np.ndarray
+    avg_profit: np.ndarray
+    sample_size: np.ndarray
+
+def build_columns(results):
+    """Extract the hot numeric columns of a Record list into NumPy arrays.
+
+    One walk over the records fills all six columns, instead of six
+    separate fromiter scans of the same list.
+    """
+    np = _ensure_numpy()
+    rates, rounds, preds, balance, profit, sizes = [], [], [], [], [], []
+    for r in results:
+        rates.append(r.success_rate)
+        rounds.append(r.avg_rounds_to_hit)
+        preds.append(r.avg_predictions_per_point)
+        balance.append(r.balance_score or 0)
+        profit.append(r.avg_profit if r.avg_profit is not None else np.nan)
+        sizes.append(r.params['sample_size'])
+    return Columns(
+        success_rate=np.array(rates, dtype=np.float64),
+        avg_rounds_to_hit=np.array(rounds, dtype=np.float64),
+        avg_predictions_per_point=np.array(preds, dtype=np.float64),
+        balance_score=np.array(balance, dtype=np.float64),
+        avg_profit=np.array(profit, dtype=np.float64),
+        sample_size=np.array(sizes, dtype=np.int32),
+    )
+
+def _to_records(data):
+    """Convert the raw JSON into {pattern_size: [Record, ...]}.
+
+    Keying by the pattern size itself means downstream functions never have
+    to probe results[0] to rediscover which size a list belongs to.
+    """
+    by_size = {}
+    for key, lst in data.items():
+        records = [Record(
+            pattern_size=d.get('pattern_size', 5),
+            success_rate=d['success_rate'],
+            avg_rounds_to_hit=d['avg_rounds_to_hit'],
+            avg_predictions_per_point=d['avg_predictions_per_point'],
+            balance_score=d.get('balance_score'),
+            maintaining_rate=d.get('maintaining_rate'),
+            avg_profit=d.get('avg_profit'),
+            total_successes=d['total_successes'],
+            total_predictions=d['total_predictions'],
+            params=d['params'],
+        ) for d in lst]
+        # Keys look like "pattern_size_5"; fall back to the records themselves
+        try:
+            size = int(str(key).rsplit('_', 1)[-1])
+        except ValueError:
+            size = records[0].pattern_size if records else 0
+        by_size[size] = records
+    return by_size
 
 def load_results(filepath=None):
     """Load optimization results from JSON"""
@@ -25,222 +190,290 @@ def load_results(filepath=None):
     else:
         # Default to optimization-results.json in scripts directory
         results_file = Path(__file__).parent / 'optimization-results.json'
-    
+
     if not results_file.exists():
         print(f"Error: Results file not found: {results_file}")
         sys.exit(1)
-    
+
     print(f"Loading results from: {results_file}\n")
+    if ijson and results_file.stat().st_size >= STREAM_THRESHOLD:
+        # Incremental parse: only one pattern-size list is being built at a
+        # time, so peak memory stays near the final dict size
+        data = {}
+        with open(results_file, 'rb') as f:
+            for key, records in ijson.kvitems(f, ''):
+                data[key] = records
+        return _to_records(data)
+    if orjson and results_file.stat().st_size >= SMALL_FILE_THRESHOLD:
+        # mmap instead of read(): the kernel pages the file straight into the
+        # parser with no userspace copy of the whole contents
+        with open(results_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                if hasattr(buf, 'madvise'):
+                    buf.madvise(mmap.MADV_SEQUENTIAL)  # parser reads front-to-back
+                return _to_records(orjson.loads(memoryview(buf)))
     with open(results_file, 'r') as f:
-        return json.load(f)
+        return _to_records(json.load(f))
 
-def analyze_pattern_size(pattern_size, results):
+def analyze_pattern_size(pattern_size, results, cols=None):
     """Analyze results for a specific pattern size"""
-    print(f"\n{'='*100}")
-    print(f"PATTERN SIZE {pattern_size} ANALYSIS")
-    print(f"{'='*100}\n")
+    # Buffer all output and emit it in one write at the end (one syscall
+    # instead of one per line)
+    out = []
+    out.append(f"\n{'='*100}")
+    out.append(f"PATTERN SIZE {pattern_size} ANALYSIS")
+    out.append(f"{'='*100}\n")
     
     if not results:
-        print("No results found.")
+        out.append("No results found.")
+        sys.stdout.write("\n".join(out) + "\n")
         return
+
+    # Pick the per-criterion winners. Big sweeps go through the shared SoA
+    # columns with masked argmin/argmax; small ones aren't worth the NumPy
+    # import and use plain min/max passes.
+    if cols is None and len(results) >= NUMPY_MIN_ROWS:
+        cols = build_columns(results)
+
+    if cols is not None:
+        rates = cols.success_rate
+        rounds_col = cols.avg_rounds_to_hit
+        balance_col = cols.balance_score
+        profit_col = cols.avg_profit
+
+        best = results[int(rates.argmax())]
+
+        fast_mask = (rates >= 5) & (rounds_col > 0)
+        fastest = results[int(np.where(fast_mask, rounds_col, np.inf).argmin())] if fast_mask.any() else None
+
+        balance_mask = balance_col > 0
+        balanced = results[int(np.where(balance_mask, balance_col, -np.inf).argmax())] if balance_mask.any() else None
+
+        profit_mask = profit_col > 0  # NaN (missing avg_profit) compares False
+        profitable = results[int(np.where(profit_mask, profit_col, -np.inf).argmax())] if profit_mask.any() else None
+
+        selective_mask = rates >= 10
+        selective = results[int(np.where(selective_mask, cols.avg_predictions_per_point, np.inf).argmin())] if selective_mask.any() else None
+    else:
+        best = max(results, key=attrgetter('success_rate'))
+        fastest = min((r for r in results if r.success_rate >= 5 and r.avg_rounds_to_hit > 0),
+                      key=attrgetter('avg_rounds_to_hit'), default=None)
+        balanced = max((r for r in results if (r.balance_score or 0) > 0),
+                       key=attrgetter('balance_score'), default=None)
+        profitable = max((r for r in results if r.avg_profit is not None and r.avg_profit > 0),
+                         key=attrgetter('avg_profit'), default=None)
+        selective = min((r for r in results if r.success_rate >= 10), key=_BY_PREDS, default=None)
+
+    p = best.params
     
-    # Best by success rate
-    best = results[0]
-    p = best['params']
-    
-    print(f"📊 BEST OVERALL (Highest Success Rate):")
-    print(f"   Settings: sample_size={p['sample_size']}, min_hits={p['min_hits']}, max_hits={p['max_hits']}, not_hit_in={p['not_hit_in']}")
-    print(f"   Success Rate: {best['success_rate']:.2f}% ({best['total_successes']}/{best['total_predictions']} patterns completed)")
+    out.append(f"📊 BEST OVERALL (Highest Success Rate):")
+    out.append(_PARAMS_FMT(p))
+    out.append(f"   Success Rate: {best.success_rate:.2f}% ({best.total_successes}/{best.total_predictions} patterns completed)")
     
     # Show maintaining metrics if available
-    if 'maintaining_rate' in best and best['maintaining_rate'] is not None:
-        print(f"   Maintaining Rate: {best['maintaining_rate']:.2f}% (patterns that didn't lose money)")
-    if 'avg_profit' in best and best['avg_profit'] is not None:
-        print(f"   Avg Profit: {best['avg_profit']:.2f}x per pattern (includes losses)")
+    if best.maintaining_rate is not None:
+        out.append(f"   Maintaining Rate: {best.maintaining_rate:.2f}% (patterns that didn't lose money)")
+    if best.avg_profit is not None:
+        out.append(f"   Avg Profit: {best.avg_profit:.2f}x per pattern (includes losses)")
     
-    print(f"   Avg Rounds to Complete: {best['avg_rounds_to_hit']:.1f} rounds")
-    print(f"   Avg Patterns Shown: {best['avg_predictions_per_point']:.1f} per prediction")
-    print(f"   What this means: Out of every {best['avg_predictions_per_point']:.0f} patterns shown, about {best['success_rate']/100 * best['avg_predictions_per_point']:.1f} will complete")
+    out.append(f"   Avg Rounds to Complete: {best.avg_rounds_to_hit:.1f} rounds")
+    out.append(f"   Avg Patterns Shown: {best.avg_predictions_per_point:.1f} per prediction")
+    out.append(f"   What this means: Out of every {best.avg_predictions_per_point:.0f} patterns shown, about {best.success_rate/100 * best.avg_predictions_per_point:.1f} will complete")
     
     # Find fastest completion (min 5% success rate)
-    fast_results = [r for r in results if r['success_rate'] >= 5 and r['avg_rounds_to_hit'] > 0]
-    if fast_results:
-        fast_results.sort(key=lambda x: x['avg_rounds_to_hit'])
-        fastest = fast_results[0]
-        p = fastest['params']
-        print(f"\n⚡ FASTEST COMPLETIONS (≥5% success):")
-        print(f"   Settings: sample_size={p['sample_size']}, min_hits={p['min_hits']}, max_hits={p['max_hits']}, not_hit_in={p['not_hit_in']}")
-        print(f"   Success Rate: {fastest['success_rate']:.2f}%")
-        if 'maintaining_rate' in fastest and fastest['maintaining_rate'] is not None:
-            print(f"   Maintaining Rate: {fastest['maintaining_rate']:.2f}%")
-        if 'avg_profit' in fastest and fastest['avg_profit'] is not None:
-            print(f"   Avg Profit: {fastest['avg_profit']:.2f}x")
-        print(f"   Avg Rounds to Complete: {fastest['avg_rounds_to_hit']:.1f} rounds")
+    if fastest is not None:
+        p = fastest.params
+        out.append(f"\n⚡ FASTEST COMPLETIONS (≥5% success):")
+        out.append(_PARAMS_FMT(p))
+        out.append(f"   Success Rate: {fastest.success_rate:.2f}%")
+        if fastest.maintaining_rate is not None:
+            out.append(f"   Maintaining Rate: {fastest.maintaining_rate:.2f}%")
+        if fastest.avg_profit is not None:
+            out.append(f"   Avg Profit: {fastest.avg_profit:.2f}x")
+        out.append(f"   Avg Rounds to Complete: {fastest.avg_rounds_to_hit:.1f} rounds")
     
     # Best balance
-    balanced_results = [r for r in results if r.get('balance_score', 0) > 0]
-    if balanced_results:
-        balanced_results.sort(key=lambda x: x['balance_score'], reverse=True)
-        balanced = balanced_results[0]
-        p = balanced['params']
-        print(f"\n⚖️  BEST BALANCED (Success × Speed):")
-        print(f"   Settings: sample_size={p['sample_size']}, min_hits={p['min_hits']}, max_hits={p['max_hits']}, not_hit_in={p['not_hit_in']}")
-        print(f"   Success Rate: {balanced['success_rate']:.2f}%")
-        if 'maintaining_rate' in balanced and balanced['maintaining_rate'] is not None:
-            print(f"   Maintaining Rate: {balanced['maintaining_rate']:.2f}%")
-        if 'avg_profit' in balanced and balanced['avg_profit'] is not None:
-            print(f"   Avg Profit: {balanced['avg_profit']:.2f}x")
-        print(f"   Avg Rounds to Complete: {balanced['avg_rounds_to_hit']:.1f} rounds")
-        print(f"   Balance Score: {balanced['balance_score']:.2f}")
+    if balanced is not None:
+        p = balanced.params
+        out.append(f"\n⚖️  BEST BALANCED (Success × Speed):")
+        out.append(_PARAMS_FMT(p))
+        out.append(f"   Success Rate: {balanced.success_rate:.2f}%")
+        if balanced.maintaining_rate is not None:
+            out.append(f"   Maintaining Rate: {balanced.maintaining_rate:.2f}%")
+        if balanced.avg_profit is not None:
+            out.append(f"   Avg Profit: {balanced.avg_profit:.2f}x")
+        out.append(f"   Avg Rounds to Complete: {balanced.avg_rounds_to_hit:.1f} rounds")
+        out.append(f"   Balance Score: {balanced.balance_score:.2f}")
     
     # Most profitable (if maintaining data available)
-    profitable_results = [r for r in results if 'avg_profit' in r and r['avg_profit'] is not None and r['avg_profit'] > 0]
-    if profitable_results:
-        profitable_results.sort(key=lambda x: x['avg_profit'], reverse=True)
-        profitable = profitable_results[0]
-        p = profitable['params']
-        print(f"\n💰 MOST PROFITABLE (Highest avg profit):")
-        print(f"   Settings: sample_size={p['sample_size']}, min_hits={p['min_hits']}, max_hits={p['max_hits']}, not_hit_in={p['not_hit_in']}")
-        print(f"   Avg Profit: {profitable['avg_profit']:.2f}x per pattern")
-        print(f"   Success Rate: {profitable['success_rate']:.2f}%")
-        print(f"   Maintaining Rate: {profitable.get('maintaining_rate', 0):.2f}%")
-        print(f"   Why it matters: Accounts for partial hits + full completions profitability")
+    if profitable is not None:
+        p = profitable.params
+        out.append(f"\n💰 MOST PROFITABLE (Highest avg profit):")
+        out.append(_PARAMS_FMT(p))
+        out.append(f"   Avg Profit: {profitable.avg_profit:.2f}x per pattern")
+        out.append(f"   Success Rate: {profitable.success_rate:.2f}%")
+        out.append(f"   Maintaining Rate: {profitable.maintaining_rate or 0:.2f}%")
+        out.append(f"   Why it matters: Accounts for partial hits + full completions profitability")
     
     # Most selective (fewest predictions, but high success)
-    selective_results = [r for r in results if r['success_rate'] >= 10]
-    if selective_results:
-        selective_results.sort(key=lambda x: x['avg_predictions_per_point'])
-        selective = selective_results[0]
-        p = selective['params']
-        print(f"\n🎯 MOST SELECTIVE (≥10% success, fewest predictions):")
-        print(f"   Settings: sample_size={p['sample_size']}, min_hits={p['min_hits']}, max_hits={p['max_hits']}, not_hit_in={p['not_hit_in']}")
-        print(f"   Success Rate: {selective['success_rate']:.2f}%")
-        print(f"   Avg Patterns Shown: {selective['avg_predictions_per_point']:.1f} per prediction")
-        print(f"   Why it matters: Fewer patterns = easier to track, higher quality signals")
-    
-    # Sample size impact
-    print(f"\n📈 SAMPLE SIZE IMPACT:")
-    sample_sizes = {}
-    for r in results:
-        size = r['params']['sample_size']
-        if size not in sample_sizes:
-            sample_sizes[size] = []
-        sample_sizes[size].append(r['success_rate'])
+    if selective is not None:
+        p = selective.params
+        out.append(f"\n🎯 MOST SELECTIVE (≥10% success, fewest predictions):")
+        out.append(_PARAMS_FMT(p))
+        out.append(f"   Success Rate: {selective.success_rate:.2f}%")
+        out.append(f"   Avg Patterns Shown: {selective.avg_predictions_per_point:.1f} per prediction")
+        out.append(f"   Why it matters: Fewer patterns = easier to track, higher quality signals")
     
-    for size in sorted(sample_sizes.keys()):
-        avg_success = sum(sample_sizes[size]) / len(sample_sizes[size])
-        print(f"   Sample Size {size:3d}: Avg {avg_success:.2f}% success across {len(sample_sizes[size])} tests")
+    # Sample size impact - grouped mean: one C/native pass on big sweeps,
+    # plain dict grouping on small ones
+    out.append(f"\n📈 SAMPLE SIZE IMPACT:")
+    if cols is not None:
+        uniq, inv = np.unique(cols.sample_size, return_inverse=True)
+        sums, counts = _groupby_mean(inv, cols.success_rate, len(uniq))
+        size_stats = zip(uniq, sums / counts, counts)
+    else:
+        groups = {}
+        for r in results:
+            groups.setdefault(r.params['sample_size'], []).append(r.success_rate)
+        size_stats = ((size, sum(v) / len(v), len(v)) for size, v in sorted(groups.items()))
+
+    for size, avg_success, count in size_stats:
+        out.append(f"   Sample Size {size:3d}: Avg {avg_success:.2f}% success across {count} tests")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 def compare_pattern_sizes(all_results):
     """Compare performance across different pattern sizes"""
-    print(f"\n{'='*100}")
-    print(f"PATTERN SIZE COMPARISON")
-    print(f"{'='*100}\n")
+    out = []
+    out.append(f"\n{'='*100}")
+    out.append(f"PATTERN SIZE COMPARISON")
+    out.append(f"{'='*100}\n")
     
     comparison = []
     
-    for key, results in all_results.items():
-        pattern_size = results[0]['pattern_size'] if results else 0
+    for pattern_size, results in all_results.items():
         best = results[0] if results else None
         
         if best:
             comparison.append({
                 'size': pattern_size,
-                'success_rate': best['success_rate'],
-                'avg_rounds': best['avg_rounds_to_hit'],
-                'avg_patterns': best['avg_predictions_per_point'],
-                'expected_hits': best['success_rate']/100 * best['avg_predictions_per_point'],
-                'params': best['params']
+                'success_rate': best.success_rate,
+                'avg_rounds': best.avg_rounds_to_hit,
+                'avg_patterns': best.avg_predictions_per_point,
+                'expected_hits': best.success_rate/100 * best.avg_predictions_per_point,
+                'params': best.params
             })
     
     # Sort by success rate
-    comparison.sort(key=lambda x: x['success_rate'], reverse=True)
+    comparison.sort(key=_BY_SUCCESS, reverse=True)
     
-    print(f"{'Size':<6} {'Success%':<12} {'Avg Rounds':<12} {'Patterns/Pred':<15} {'Expected Hits':<15} {'Best Config'}")
-    print("-" * 100)
+    out.append(f"{'Size':<6} {'Success%':<12} {'Avg Rounds':<12} {'Patterns/Pred':<15} {'Expected Hits':<15} {'Best Config'}")
+    out.append("-" * 100)
     
     for c in comparison:
         p = c['params']
         config = f"s={p['sample_size']},h={p['min_hits']}-{p['max_hits']},n={p['not_hit_in']}"
-        print(f"{c['size']:<6} {c['success_rate']:<12.2f} {c['avg_rounds']:<12.1f} {c['avg_patterns']:<15.1f} {c['expected_hits']:<15.2f} {config}")
+        out.append(_COMPARE_ROW(c['size'], c['success_rate'], c['avg_rounds'], c['avg_patterns'], c['expected_hits'], config))
     
-    print(f"\n💡 INTERPRETATION:")
-    print(f"   - Success%: What % of shown patterns will complete")
-    print(f"   - Patterns/Pred: How many patterns shown on average")
-    print(f"   - Expected Hits: How many patterns will complete per prediction (Success% × Patterns/Pred)")
-    print(f"   - Smaller patterns = Higher success rates but you need to track more")
-    print(f"   - Larger patterns = Lower success but cleaner signals\n")
+    out.append(f"\n💡 INTERPRETATION:")
+    out.append(f"   - Success%: What % of shown patterns will complete")
+    out.append(f"   - Patterns/Pred: How many patterns shown on average")
+    out.append(f"   - Expected Hits: How many patterns will complete per prediction (Success% × Patterns/Pred)")
+    out.append(f"   - Smaller patterns = Higher success rates but you need to track more")
+    out.append(f"   - Larger patterns = Lower success but cleaner signals\n")
 
-def recommendation(all_results):
+    sys.stdout.write("\n".join(out) + "\n")
+
+def recommendation(all_results, cols_by_key=None):
     """Provide actionable recommendations"""
-    print(f"\n{'='*100}")
-    print(f"🎯 RECOMMENDATIONS")
-    print(f"{'='*100}\n")
+    out = []
+    out.append(f"\n{'='*100}")
+    out.append(f"🎯 RECOMMENDATIONS")
+    out.append(f"{'='*100}\n")
     
-    # Find best of each category
+    # One flattening pass that tracks the success-rate winner as it goes.
+    # Loaded records are never written to, so re-running the analysis on the
+    # same data cannot double-apply derived fields.
     all_configs = []
-    for key, results in all_results.items():
-        for r in results:
-            r['pattern_size'] = r.get('pattern_size', 5)
-            all_configs.append(r)
+    best_overall = None
+    for r in chain.from_iterable(all_results.values()):
+        all_configs.append(r)
+        if best_overall is None or r.success_rate > best_overall.success_rate:
+            best_overall = r
     
-    # Best overall
-    all_configs.sort(key=lambda x: x['success_rate'], reverse=True)
-    best_overall = all_configs[0]
+    out.append(f"1️⃣  FOR HIGHEST SUCCESS RATE:")
+    out.append(f"   Use Pattern Size: {best_overall.pattern_size}")
+    out.append(f"   Settings: {best_overall.params}")
+    out.append(f"   Expected: {best_overall.success_rate:.1f}% of patterns complete in ~{best_overall.avg_rounds_to_hit:.0f} rounds")
+    out.append(f"   Trade-off: Will show ~{best_overall.avg_predictions_per_point:.0f} patterns (more to track)\n")
     
-    print(f"1️⃣  FOR HIGHEST SUCCESS RATE:")
-    print(f"   Use Pattern Size: {best_overall['pattern_size']}")
-    print(f"   Settings: {best_overall['params']}")
-    print(f"   Expected: {best_overall['success_rate']:.1f}% of patterns complete in ~{best_overall['avg_rounds_to_hit']:.0f} rounds")
-    print(f"   Trade-off: Will show ~{best_overall['avg_predictions_per_point']:.0f} patterns (more to track)\n")
+    # Best balance - vectorized on big sweeps instead of writing r['balance']
+    # into every record and re-sorting (the records stay unmutated either way)
+    if len(all_configs) >= NUMPY_MIN_ROWS:
+        np = _ensure_numpy()
+        if cols_by_key and all(c is not None for c in cols_by_key.values()):
+            sr = np.concatenate([cols_by_key[key].success_rate for key in all_results])
+            rounds = np.concatenate([cols_by_key[key].avg_rounds_to_hit for key in all_results])
+        else:
+            sr = np.fromiter((r.success_rate for r in all_configs), dtype=np.float64, count=len(all_configs))
+            rounds = np.fromiter((r.avg_rounds_to_hit for r in all_configs), dtype=np.float64, count=len(all_configs))
+        mask = rounds > 0
+        balance = np.where(mask, sr * (50.0 / np.where(mask, rounds, 1.0)), 0.0)
+        best_balance = all_configs[int(balance.argmax())]
+    else:
+        best_balance = max(
+            all_configs,
+            key=lambda r: r.success_rate * (50.0 / r.avg_rounds_to_hit) if r.avg_rounds_to_hit > 0 else 0.0
+        )
     
-    # Best balance
-    for r in all_configs:
-        if r['avg_rounds_to_hit'] > 0:
-            r['balance'] = r['success_rate'] * (50 / r['avg_rounds_to_hit'])
-    all_configs.sort(key=lambda x: x.get('balance', 0), reverse=True)
-    best_balance = all_configs[0]
-    
-    print(f"2️⃣  FOR BEST BALANCE (Success × Speed):")
-    print(f"   Use Pattern Size: {best_balance['pattern_size']}")
-    print(f"   Settings: {best_balance['params']}")
-    print(f"   Expected: {best_balance['success_rate']:.1f}% success, completes in {best_balance['avg_rounds_to_hit']:.0f} rounds")
-    print(f"   Shows: ~{best_balance['avg_predictions_per_point']:.0f} patterns per prediction\n")
-    
-    # Most selective
-    selective_configs = [r for r in all_configs if r['success_rate'] >= 5]
-    selective_configs.sort(key=lambda x: x['avg_predictions_per_point'])
+    out.append(f"2️⃣  FOR BEST BALANCE (Success × Speed):")
+    out.append(f"   Use Pattern Size: {best_balance.pattern_size}")
+    out.append(f"   Settings: {best_balance.params}")
+    out.append(f"   Expected: {best_balance.success_rate:.1f}% success, completes in {best_balance.avg_rounds_to_hit:.0f} rounds")
+    out.append(f"   Shows: ~{best_balance.avg_predictions_per_point:.0f} patterns per prediction\n")
+    
+    # Most selective - top-1 query, so O(N) min beats sorting the whole list
+    selective_configs = [r for r in all_configs if r.success_rate >= 5]
     if selective_configs:
-        best_selective = selective_configs[0]
-        print(f"3️⃣  FOR CLEANEST SIGNALS (Fewest patterns, still ≥5% success):")
-        print(f"   Use Pattern Size: {best_selective['pattern_size']}")
-        print(f"   Settings: {best_selective['params']}")
-        print(f"   Expected: {best_selective['success_rate']:.1f}% success")
-        print(f"   Shows: Only ~{best_selective['avg_predictions_per_point']:.1f} patterns (easy to track)\n")
+        best_selective = min(selective_configs, key=_BY_PREDS)
+        out.append(f"3️⃣  FOR CLEANEST SIGNALS (Fewest patterns, still ≥5% success):")
+        out.append(f"   Use Pattern Size: {best_selective.pattern_size}")
+        out.append(f"   Settings: {best_selective.params}")
+        out.append(f"   Expected: {best_selective.success_rate:.1f}% success")
+        out.append(f"   Shows: Only ~{best_selective.avg_predictions_per_point:.1f} patterns (easy to track)\n")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 def main():
-    parser = argparse.ArgumentParser(description='Analyze Keno optimization results')
-    parser.add_argument('file', nargs='?', default=None,
-                       help='Path to results JSON file (optional, uses optimization-results.json by default)')
-    args = parser.parse_args()
+    # Single optional positional - a plain argv check keeps cold start fast
+    # (argparse alone costs ~15ms per invocation)
+    filepath = sys.argv[1] if len(sys.argv) > 1 else None
+    if filepath in ('-h', '--help'):
+        print(__doc__)
+        sys.exit(0)
     
     print("\n" + "="*100)
     print("KENO PATTERN OPTIMIZATION ANALYSIS")
     print("="*100 + "\n")
     
-    results = load_results(args.file)
-    
+    results = load_results(filepath)
+
+    # Extract the numeric columns once per pattern size (only for sets big
+    # enough to justify NumPy); every analyzer below reads the same arrays
+    cols_by_key = {
+        key: build_columns(records) if len(records) >= NUMPY_MIN_ROWS else None
+        for key, records in results.items()
+    }
+
     # Analyze each pattern size
-    for key in sorted(results.keys()):
-        pattern_results = results[key]
-        pattern_size = pattern_results[0]['pattern_size'] if pattern_results else 0
-        analyze_pattern_size(pattern_size, pattern_results)
+    for pattern_size in sorted(results.keys()):
+        analyze_pattern_size(pattern_size, results[pattern_size], cols_by_key[pattern_size])
     
     # Compare across sizes
     compare_pattern_sizes(results)
     
     # Provide recommendations
-    recommendation(results)
+    recommendation(results, cols_by_key)
     
     print("\n" + "="*100)
     print("Analysis complete!")
@@ -4,337 +4,605 @@ Keno History Trend Analysis
 Identifies patterns and trends before all 40 numbers hit
 """
 
+import heapq
 import json
+import os
 import sys
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import reduce
+from itertools import combinations, repeat
+from operator import itemgetter, or_
 from pathlib import Path
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _emit(lines):
+    """Flush a buffered report section with a single write"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+@dataclass(slots=True)
+class HistoryView:
+    """Precomputed per-round views shared by all analyzers.
+
+    Built once at load time so each analyzer doesn't re-derive the same
+    drawn lists, bitmasks, and membership matrix from the raw dicts.
+    """
+    n_rounds: int         # number of rounds in the history
+    drawn_lists: list     # drawn numbers per round
+    drawn_masks: list     # int bitmask of drawn numbers per round
+    membership: np.ndarray  # (rounds, 41) uint8; column 0 unused
+    hit_rounds: list      # per number, ascending array of rounds it was drawn
+    first_hit_round: np.ndarray  # (41,) first round each number appeared, -1 if never
+
+def build_history_view(drawn_lists):
+    """Derive the shared per-round structures from the drawn-number lists"""
+    M = np.zeros((len(drawn_lists), 41), dtype=np.uint8)
+    drawn_masks = []
+    for i, drawn in enumerate(drawn_lists):
+        M[i, drawn] = 1
+        drawn_masks.append(reduce(or_, (1 << n for n in drawn), 0))
+
+    # np.nonzero on the transposed matrix yields hits grouped by number with
+    # rounds ascending, so one sweep gives every number's hit-round array
+    nums, rounds_idx = np.nonzero(M.T)
+    starts = np.searchsorted(nums, np.arange(42))
+    hit_rounds = [rounds_idx[starts[n]:starts[n + 1]] for n in range(41)]
+    first_hit_round = np.where(M.any(axis=0), M.argmax(axis=0), -1)
+
+    return HistoryView(len(drawn_lists), drawn_lists, drawn_masks, M, hit_rounds, first_hit_round)
+
+def _load_cached_drawn_lists(cache_path, src):
+    """Return the drawn lists from a sidecar cache if it matches the source"""
+    try:
+        stat = src.stat()
+        with np.load(cache_path) as npz:
+            if float(npz['mtime']) != stat.st_mtime or int(npz['size']) != stat.st_size:
+                return None
+            lengths = npz['lengths']
+            flat = npz['flat']
+    except (OSError, KeyError, ValueError):
+        return None  # missing, stale, or corrupt cache: fall back to a parse
+
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    return [flat[offsets[i]:offsets[i + 1]].tolist() for i in range(len(lengths))]
+
+def _write_drawn_lists_cache(cache_path, src, drawn_lists):
+    """Best-effort write of the sidecar cache; failures are ignored"""
+    try:
+        stat = src.stat()
+        np.savez(
+            cache_path,
+            mtime=stat.st_mtime,
+            size=stat.st_size,
+            lengths=np.array([len(drawn) for drawn in drawn_lists], dtype=np.int32),
+            flat=np.array([n for drawn in drawn_lists for n in drawn], dtype=np.int16),
+        )
+    except OSError:
+        pass
+
 def load_history(file_path):
-    """Load keno history from JSON file"""
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    """Load keno history from JSON file, reusing a sidecar cache when fresh"""
+    src = Path(file_path)
+    cache_path = src.with_suffix(src.suffix + '.cache.npz')
+
+    drawn_lists = _load_cached_drawn_lists(cache_path, src)
+    if drawn_lists is not None:
+        return build_history_view(drawn_lists)
+
+    # orjson parses several times faster than the stdlib; its decode error
+    # subclasses json.JSONDecodeError so the caller's handling still applies
+    if orjson is not None:
+        with open(src, 'rb') as f:
+            rounds = orjson.loads(f.read())
+    else:
+        with open(src, 'r') as f:
+            rounds = json.load(f)
+
+    drawn_lists = [bet.get('drawn', []) for bet in rounds]
+    _write_drawn_lists_cache(cache_path, src, drawn_lists)
+    return build_history_view(drawn_lists)
 
-def analyze_number_appearance_order(history):
+def analyze_number_appearance_order(view):
     """Analyze which numbers appear first vs last across all rounds"""
     print("\n" + "="*80)
     print("NUMBER APPEARANCE ORDER ANALYSIS")
     print("="*80)
     
-    # Track when each number (1-40) first appears
-    first_appearances = defaultdict(list)
-    last_appearances = defaultdict(list)
-    appearance_positions = defaultdict(list)
-    
-    # Track all 40 numbers seen
-    all_numbers_seen = set()
+    # First appearances come straight from the precomputed sweep state
+    first_hit = view.first_hit_round
     rounds_to_see_all = None
-    
-    for round_idx, bet in enumerate(history):
-        drawn = bet.get('drawn', [])
-        
-        for pos, num in enumerate(drawn):
-            if num not in all_numbers_seen:
-                first_appearances[num].append(round_idx)
-                all_numbers_seen.add(num)
-            
-            appearance_positions[num].append(pos)
-        
-        # Check if we've seen all 40 numbers
-        if len(all_numbers_seen) == 40 and rounds_to_see_all is None:
-            rounds_to_see_all = round_idx + 1
-            # Identify which numbers appeared last
-            for num in range(1, 41):
-                if num in first_appearances and first_appearances[num]:
-                    if first_appearances[num][0] >= round_idx - 10:
-                        last_appearances[num] = first_appearances[num][0]
-    
-    print(f"\nTotal rounds analyzed: {len(history)}")
+    if all(first_hit[num] >= 0 for num in range(1, 41)):
+        rounds_to_see_all = int(first_hit[1:].max()) + 1
+
+    # Per-draw positions aren't derivable from the membership matrix, so
+    # they still need one walk over the drawn lists - but they accumulate
+    # into a fixed (number x position) histogram instead of per-number lists
+    max_draw = max((len(drawn) for drawn in view.drawn_lists), default=0)
+    position_hist = np.zeros((41, max_draw), dtype=np.int32)
+    nums = []
+    positions = []
+    for drawn in view.drawn_lists:
+        nums.extend(drawn)
+        positions.extend(range(len(drawn)))
+    if nums:
+        np.add.at(position_hist, (nums, positions), 1)
+
+    print(f"\nTotal rounds analyzed: {view.n_rounds}")
     print(f"Rounds needed to see all 40 numbers: {rounds_to_see_all}")
-    
+
     # Find numbers that appear earliest on average
-    avg_first_appearance = {}
-    for num in range(1, 41):
-        if num in first_appearances and first_appearances[num]:
-            avg_first_appearance[num] = sum(first_appearances[num]) / len(first_appearances[num])
-    
-    sorted_early = sorted(avg_first_appearance.items(), key=lambda x: x[1])[:10]
-    sorted_late = sorted(avg_first_appearance.items(), key=lambda x: x[1], reverse=True)[:10]
-    
-    print("\n--- EARLIEST APPEARING NUMBERS (most frequent) ---")
-    for num, avg_round in sorted_early:
-        print(f"  Number {num:2d}: First seen around round {avg_round:.1f}")
-    
-    print("\n--- LATEST APPEARING NUMBERS (rarest) ---")
-    for num, avg_round in sorted_late:
-        print(f"  Number {num:2d}: First seen around round {avg_round:.1f}")
-    
-    return first_appearances, appearance_positions
+    avg_first_appearance = {
+        num: float(first_hit[num]) for num in range(1, 41) if first_hit[num] >= 0
+    }
 
-def analyze_hot_cold_streaks(history):
+    sorted_early = heapq.nsmallest(10, avg_first_appearance.items(), key=itemgetter(1))
+    sorted_late = heapq.nlargest(10, avg_first_appearance.items(), key=itemgetter(1))
+    
+    out = ["\n--- EARLIEST APPEARING NUMBERS (most frequent) ---"]
+    out.extend(f"  Number {num:2d}: First seen around round {avg_round:.1f}" for num, avg_round in sorted_early)
+    out.append("\n--- LATEST APPEARING NUMBERS (rarest) ---")
+    out.extend(f"  Number {num:2d}: First seen around round {avg_round:.1f}" for num, avg_round in sorted_late)
+    _emit(out)
+
+    return avg_first_appearance, position_hist
+
+def analyze_hot_cold_streaks(view):
     """Analyze hot and cold streaks for each number"""
     print("\n" + "="*80)
     print("HOT/COLD STREAK ANALYSIS")
     print("="*80)
-    
-    # Track last seen round for each number
-    last_seen = {}
-    max_gap = defaultdict(int)
-    current_gap = defaultdict(int)
-    hot_streaks = defaultdict(list)  # Track consecutive appearances
-    
-    for round_idx, bet in enumerate(history):
-        drawn = bet.get('drawn', [])
-        
-        # Increment gaps for all numbers
-        for num in range(1, 41):
-            current_gap[num] += 1
-        
-        # Reset gap for drawn numbers
-        for num in drawn:
-            if current_gap[num] > max_gap[num]:
-                max_gap[num] = current_gap[num]
-            
-            # Track hot streaks
-            if num in last_seen and round_idx - last_seen[num] <= 3:
-                hot_streaks[num].append(round_idx)
-            
-            current_gap[num] = 0
-            last_seen[num] = round_idx
-    
-    print("\n--- NUMBERS WITH LONGEST DRY SPELLS (max rounds without appearing) ---")
-    sorted_gaps = sorted(max_gap.items(), key=lambda x: x[1], reverse=True)[:10]
-    for num, gap in sorted_gaps:
-        print(f"  Number {num:2d}: Max gap of {gap} rounds")
-    
-    print("\n--- NUMBERS WITH MOST HOT STREAKS (appeared within 3 rounds) ---")
-    streak_counts = {num: len(streaks) for num, streaks in hot_streaks.items()}
-    sorted_hot = sorted(streak_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-    for num, count in sorted_hot:
-        print(f"  Number {num:2d}: {count} hot streaks")
-    
-    return max_gap, hot_streaks
 
-def analyze_pattern_before_rare_numbers(history):
+    # Each number's hit rounds come from the precomputed sweep state, so no
+    # per-column scans of the membership matrix are needed here
+    max_gap = {}
+    streak_counts = {}
+    for num in range(1, 41):
+        idx = view.hit_rounds[num]
+        if idx.size == 0:
+            continue
+        # Gap ending at each hit; the first gap counts from the start
+        gaps = np.diff(np.concatenate(([-1], idx)))
+        max_gap[num] = int(gaps.max())
+        # Hot streak = hit within 3 rounds of the previous hit
+        hot = int((np.diff(idx) <= 3).sum())
+        if hot > 0:
+            streak_counts[num] = hot
+
+    sorted_gaps = heapq.nlargest(10, max_gap.items(), key=itemgetter(1))
+    sorted_hot = heapq.nlargest(10, streak_counts.items(), key=itemgetter(1))
+
+    out = ["\n--- NUMBERS WITH LONGEST DRY SPELLS (max rounds without appearing) ---"]
+    out.extend(f"  Number {num:2d}: Max gap of {gap} rounds" for num, gap in sorted_gaps)
+    out.append("\n--- NUMBERS WITH MOST HOT STREAKS (appeared within 3 rounds) ---")
+    out.extend(f"  Number {num:2d}: {count} hot streaks" for num, count in sorted_hot)
+    _emit(out)
+
+    return max_gap, streak_counts
+
+def analyze_pattern_before_rare_numbers(view):
     """Analyze what patterns appear before rarely seen numbers finally show up"""
     print("\n" + "="*80)
     print("PATTERNS BEFORE RARE NUMBERS APPEAR")
     print("="*80)
     
     # Identify rare numbers (those that take longest to appear)
-    first_appearances = {}
-    for round_idx, bet in enumerate(history):
-        drawn = bet.get('drawn', [])
-        for num in drawn:
-            if num not in first_appearances:
-                first_appearances[num] = round_idx
+    first_hit = view.first_hit_round
+    first_appearances = {
+        num: int(first_hit[num]) for num in range(1, 41) if first_hit[num] >= 0
+    }
     
     # Get top 5 rarest (appeared latest)
-    sorted_rare = sorted(first_appearances.items(), key=lambda x: x[1], reverse=True)[:5]
+    sorted_rare = heapq.nlargest(5, first_appearances.items(), key=itemgetter(1))
     
-    print("\n--- ANALYZING PATTERNS BEFORE RARE NUMBERS ---")
+    out = ["\n--- ANALYZING PATTERNS BEFORE RARE NUMBERS ---"]
     for rare_num, first_round in sorted_rare:
         if first_round < 5:
             continue
-        
-        print(f"\nNumber {rare_num} (first appeared in round {first_round + 1}):")
-        
-        # Look at 5 rounds before it appeared
+
+        out.append(f"\nNumber {rare_num} (first appeared in round {first_round + 1}):")
+
+        # Look at 5 rounds before it appeared: summing the membership rows
+        # over the window bin-counts every number at once
         lookback = min(5, first_round)
-        patterns_before = []
-        
-        for i in range(lookback):
-            round_idx = first_round - lookback + i
-            if round_idx >= 0:
-                drawn = history[round_idx].get('drawn', [])
-                patterns_before.extend(drawn)
-        
+        counts = view.membership[first_round - lookback:first_round].sum(axis=0, dtype=np.int64)
+
         # Find most common numbers in rounds leading up
-        common_before = Counter(patterns_before).most_common(10)
-        print(f"  Most common numbers in {lookback} rounds before:")
-        for num, count in common_before:
-            print(f"    {num:2d} appeared {count} times")
+        present = np.flatnonzero(counts)
+        k = min(10, present.size)
+        top = present[np.argpartition(-counts[present], k - 1)[:k]]
+        top = top[np.lexsort((top, -counts[top]))]
+        out.append(f"  Most common numbers in {lookback} rounds before:")
+        out.extend(f"    {num:2d} appeared {counts[num]} times" for num in top)
+    _emit(out)
 
-def analyze_completion_patterns(history):
+def analyze_completion_patterns(view):
     """Analyze patterns when getting close to seeing all 40 numbers"""
     print("\n" + "="*80)
     print("COMPLETION PATTERN ANALYSIS")
     print("="*80)
     
-    seen_numbers = set()
+    all_numbers_mask = (1 << 41) - 2  # bits 1..40 set
+
+    seen_mask = 0
     numbers_per_round = []
-    remaining_at_round = []
-    
-    for round_idx, bet in enumerate(history):
-        drawn = bet.get('drawn', [])
-        
-        # Track how many new numbers each round
-        new_numbers = 0
-        for num in drawn:
-            if num not in seen_numbers:
-                seen_numbers.add(num)
-                new_numbers += 1
-        
+
+    for round_idx, rmask in enumerate(view.drawn_masks):
+        # New numbers this round = drawn bits not yet in the seen mask
+        new_numbers = (rmask & ~seen_mask).bit_count()
+        seen_mask |= rmask
+
         numbers_per_round.append(new_numbers)
-        remaining_at_round.append(40 - len(seen_numbers))
-        
-        if len(seen_numbers) == 40:
+
+        if seen_mask == all_numbers_mask:
             print(f"\nAll 40 numbers seen after {round_idx + 1} rounds")
             break
     
     # Analyze when most new numbers appear
-    print("\n--- NEW NUMBERS DISCOVERY RATE ---")
+    out = ["\n--- NEW NUMBERS DISCOVERY RATE ---"]
     for i in range(0, min(len(numbers_per_round), 50), 10):
         window = numbers_per_round[i:i+10]
         avg_new = sum(window) / len(window) if window else 0
-        print(f"  Rounds {i+1}-{i+10}: Avg {avg_new:.2f} new numbers per round")
-    
+        out.append(f"  Rounds {i+1}-{i+10}: Avg {avg_new:.2f} new numbers per round")
+
     # Find which rounds had the most discovery
-    top_discovery_rounds = sorted(enumerate(numbers_per_round), key=lambda x: x[1], reverse=True)[:5]
-    print("\n--- ROUNDS WITH MOST NEW NUMBER DISCOVERIES ---")
-    for round_idx, count in top_discovery_rounds:
-        if count > 0:
-            print(f"  Round {round_idx + 1}: {count} new numbers")
+    top_discovery_rounds = heapq.nlargest(5, enumerate(numbers_per_round), key=itemgetter(1))
+    out.append("\n--- ROUNDS WITH MOST NEW NUMBER DISCOVERIES ---")
+    out.extend(
+        f"  Round {round_idx + 1}: {count} new numbers"
+        for round_idx, count in top_discovery_rounds if count > 0
+    )
+    _emit(out)
 
-def find_predictive_patterns(history):
+def find_predictive_patterns(view):
     """Try to find any predictive patterns"""
     print("\n" + "="*80)
     print("PREDICTIVE PATTERN ANALYSIS")
     print("="*80)
-    
+
     # Analyze if certain number combinations predict others
     print("\n--- ANALYZING NUMBER PAIR CORRELATIONS ---")
-    
-    # Track which numbers appear together frequently
-    pair_counts = defaultdict(int)
-    total_rounds = len(history)
-    
-    for bet in history:
-        drawn = bet.get('drawn', [])
-        # Check all pairs
-        for i, num1 in enumerate(drawn):
-            for num2 in drawn[i+1:]:
-                pair = tuple(sorted([num1, num2]))
-                pair_counts[pair] += 1
-    
-    # Find strongest correlations
-    sorted_pairs = sorted(pair_counts.items(), key=lambda x: x[1], reverse=True)[:15]
-    print("\nMost frequently occurring number pairs:")
-    for (num1, num2), count in sorted_pairs:
-        percentage = (count / total_rounds) * 100
-        print(f"  {num1:2d} & {num2:2d}: {count} times ({percentage:.1f}% of rounds)")
+
+    total_rounds = view.n_rounds
+
+    # The full 40x40 co-occurrence table comes from a single matrix multiply
+    # over the membership matrix instead of ~190 dict updates per round
+    M = view.membership
+    C = M[:, 1:].T.astype(np.int32) @ M[:, 1:].astype(np.int32)
+    
+    # Upper-triangular entries are the pair counts
+    iu = np.triu_indices(40, k=1)
+    counts = C[iu]
+    k = min(15, counts.size)
+    top = np.argpartition(-counts, k - 1)[:k]
+    top = top[np.lexsort((iu[1][top], iu[0][top], -counts[top]))]
+    # One vectorized pass over the winners instead of per-row index math
+    pair_nums1 = iu[0][top] + 1
+    pair_nums2 = iu[1][top] + 1
+    pair_counts = counts[top]
+    pair_pcts = pair_counts * (100.0 / total_rounds)
+
+    out = ["\nMost frequently occurring number pairs:"]
+    out.extend(
+        f"  {num1:2d} & {num2:2d}: {count} times ({percentage:.1f}% of rounds)"
+        for num1, num2, count, percentage in zip(pair_nums1, pair_nums2, pair_counts, pair_pcts)
+    )
+    _emit(out)
     
     # Analyze follow-up patterns
     print("\n--- FOLLOW-UP PATTERNS (if X appears, what's likely next round?) ---")
-    follow_patterns = defaultdict(lambda: defaultdict(int))
-    
-    for i in range(len(history) - 1):
-        current_drawn = history[i].get('drawn', [])
-        next_drawn = history[i + 1].get('drawn', [])
-        
-        for curr_num in current_drawn:
-            for next_num in next_drawn:
-                follow_patterns[curr_num][next_num] += 1
-    
+
+    # F[i, j] counts how often number j+1 was drawn in the round right after
+    # number i+1: one shifted matrix multiply instead of the nested
+    # current-round x next-round dict updates
+    if total_rounds > 1:
+        F = M[:-1, 1:].T.astype(np.int32) @ M[1:, 1:].astype(np.int32)
+    else:
+        F = np.zeros((40, 40), dtype=np.int32)
+
     # Find numbers with strongest follow patterns
-    print("\nNumbers that often predict others in next round:")
+    out = ["\nNumbers that often predict others in next round:"]
     for num in range(1, 11):  # Check first 10 numbers
-        if num in follow_patterns:
-            sorted_followers = sorted(follow_patterns[num].items(), key=lambda x: x[1], reverse=True)[:3]
-            if sorted_followers:
-                print(f"  After {num:2d}, most likely to see:", end=" ")
-                for follower, count in sorted_followers:
-                    print(f"{follower:2d}({count}x)", end=" ")
-                print()
-
-def analyze_pattern_completion_behavior(history, pattern_size=5, min_occurrences=5):
+        row = F[num - 1]
+        followers = np.flatnonzero(row)
+        if followers.size:
+            k = min(3, followers.size)
+            top = followers[np.argpartition(-row[followers], k - 1)[:k]]
+            top = top[np.lexsort((top, -row[top]))]
+            parts = [f"  After {num:2d}, most likely to see:"]
+            parts.extend(f"{j + 1:2d}({row[j]}x)" for j in top)
+            out.append(" ".join(parts) + " ")
+    _emit(out)
+
+# Cap on distinct patterns tracked during phase 1; keeps memory bounded on
+# large histories where unique 5-number combos run into the millions
+MAX_TRACKED_PATTERNS = 200_000
+
+class BoundedCounter:
+    """Misra-Gries heavy-hitter counter with a fixed key budget.
+
+    When the budget is full, adding an unseen key decrements every tracked
+    count and drops the zeroed keys. Any key occurring more than
+    total_adds / capacity times is guaranteed to survive, but surviving
+    counts are underestimates - recount survivors exactly before applying
+    a frequency threshold.
+    """
+
+    def __init__(self, capacity=MAX_TRACKED_PATTERNS):
+        self.capacity = capacity
+        self.counts = {}
+        self.evicted = False
+
+    def add(self, key):
+        counts = self.counts
+        if key in counts:
+            counts[key] += 1
+        elif len(counts) < self.capacity:
+            counts[key] = 1
+        else:
+            self.evicted = True
+            for k in list(counts):
+                if counts[k] == 1:
+                    del counts[k]
+                else:
+                    counts[k] -= 1
+
+def _scan_patterns_py(round_masks, pattern_masks, pattern_size):
+    """Aggregate completion behavior for each pattern in one streaming pass.
+
+    Returns, per pattern: completion count, near-miss count, partial-hit
+    count, buildup count and hit-sum before the first completion, and
+    gap sum/count/min/quick-succession count between completions.
+    """
+    n_pat = len(pattern_masks)
+    completions = [0] * n_pat
+    near = [0] * n_pat
+    partial = [0] * n_pat
+    buildup_cnt = [0] * n_pat
+    buildup_sum = [0] * n_pat
+    gap_sum = [0] * n_pat
+    gap_cnt = [0] * n_pat
+    gap_min = [0] * n_pat
+    quick = [0] * n_pat
+
+    for p, pmask in enumerate(pattern_masks):
+        first = -1
+        last = -1
+        gmin = 0
+        for r, rmask in enumerate(round_masks):
+            hits = (rmask & pmask).bit_count()
+            if hits == pattern_size:
+                if first < 0:
+                    first = r
+                else:
+                    gap = r - last
+                    gap_sum[p] += gap
+                    gap_cnt[p] += 1
+                    if gap <= 50:
+                        quick[p] += 1
+                    if gmin == 0 or gap < gmin:
+                        gmin = gap
+                last = r
+                completions[p] += 1
+            elif hits >= pattern_size - 2:
+                partial[p] += 1
+                if hits == pattern_size - 1:
+                    near[p] += 1
+                if first < 0:
+                    buildup_cnt[p] += 1
+                    buildup_sum[p] += hits
+        gap_min[p] = gmin
+
+    return completions, near, partial, buildup_cnt, buildup_sum, gap_sum, gap_cnt, gap_min, quick
+
+if njit is not None:
+    @njit(cache=True)
+    def _scan_patterns_jit(round_masks, pattern_masks, pattern_size):
+        """Compiled twin of _scan_patterns_py over int64 mask arrays"""
+        n_rounds = round_masks.shape[0]
+        n_pat = pattern_masks.shape[0]
+        completions = np.zeros(n_pat, np.int64)
+        near = np.zeros(n_pat, np.int64)
+        partial = np.zeros(n_pat, np.int64)
+        buildup_cnt = np.zeros(n_pat, np.int64)
+        buildup_sum = np.zeros(n_pat, np.int64)
+        gap_sum = np.zeros(n_pat, np.int64)
+        gap_cnt = np.zeros(n_pat, np.int64)
+        gap_min = np.zeros(n_pat, np.int64)
+        quick = np.zeros(n_pat, np.int64)
+
+        for p in range(n_pat):
+            pmask = pattern_masks[p]
+            first = -1
+            last = -1
+            gmin = 0
+            for r in range(n_rounds):
+                # SWAR popcount: numba has no int.bit_count
+                x = round_masks[r] & pmask
+                x = x - ((x >> 1) & 0x5555555555555555)
+                x = (x & 0x3333333333333333) + ((x >> 2) & 0x3333333333333333)
+                x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0F
+                hits = (x * 0x0101010101010101) >> 56
+                if hits == pattern_size:
+                    if first < 0:
+                        first = r
+                    else:
+                        gap = r - last
+                        gap_sum[p] += gap
+                        gap_cnt[p] += 1
+                        if gap <= 50:
+                            quick[p] += 1
+                        if gmin == 0 or gap < gmin:
+                            gmin = gap
+                    last = r
+                    completions[p] += 1
+                elif hits >= pattern_size - 2:
+                    partial[p] += 1
+                    if hits == pattern_size - 1:
+                        near[p] += 1
+                    if first < 0:
+                        buildup_cnt[p] += 1
+                        buildup_sum[p] += hits
+            gap_min[p] = gmin
+
+        return completions, near, partial, buildup_cnt, buildup_sum, gap_sum, gap_cnt, gap_min, quick
+else:
+    _scan_patterns_jit = None
+
+# Below this many pattern-round checks the fork/pickle overhead of a process
+# pool outweighs the win, so the scan stays serial
+PARALLEL_SCAN_MIN_WORK = 20_000_000
+
+def _scan_patterns_parallel(round_masks, pattern_masks, pattern_size):
+    """Shard _scan_patterns_py across worker processes.
+
+    Used for large scans when numba isn't installed; shards are contiguous
+    so concatenating the per-shard outputs preserves pattern order.
+    """
+    n_workers = os.cpu_count() or 1
+    if n_workers == 1:
+        return _scan_patterns_py(round_masks, pattern_masks, pattern_size)
+
+    chunk = -(-len(pattern_masks) // n_workers)
+    shards = [pattern_masks[i:i + chunk] for i in range(0, len(pattern_masks), chunk)]
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        parts = list(pool.map(
+            _scan_patterns_py, repeat(round_masks), shards, repeat(pattern_size)
+        ))
+    return tuple(
+        [value for part in parts for value in part[field]]
+        for field in range(len(parts[0]))
+    )
+
+def _pack_pattern(combo):
+    """Pack a sorted tuple of numbers into one int key (6 bits per number)"""
+    key = 0
+    for n in combo:
+        key = (key << 6) | n
+    return key
+
+def _unpack_pattern(key, pattern_size):
+    """Inverse of _pack_pattern: recover the sorted tuple of numbers"""
+    nums = []
+    for _ in range(pattern_size):
+        nums.append(key & 0x3F)
+        key >>= 6
+    return tuple(reversed(nums))
+
+def analyze_pattern_completion_behavior(view, pattern_size=5, min_occurrences=5):
     """
     Analyze which patterns 'tease' with near-misses vs patterns that build up and complete.
     Identifies patterns that frequently hit 3/5, 4/5 but rarely complete vs patterns that
     build momentum and hit multiple times after first completion.
     """
-    from itertools import combinations
-    
     print("\n" + "="*80)
     print(f"PATTERN COMPLETION BEHAVIOR ANALYSIS (Size {pattern_size})")
     print("="*80)
     
     # First pass: count pattern frequency to filter out rare ones early
     print("\nPhase 1: Counting pattern frequencies...")
-    pattern_frequency = defaultdict(int)
-    
-    for bet in history:
-        drawn = bet.get('drawn', [])
-        for combo in combinations(sorted(drawn), pattern_size):
-            pattern_frequency[combo] += 1
-    
+    counter = BoundedCounter()
+
+    # Sort each round's numbers once up front; both the counting pass and
+    # the survivor recount iterate the same sorted lists
+    sorted_drawn = [sorted(drawn) for drawn in view.drawn_lists]
+
+    # Counting with packed int keys instead of tuples: ints hash/compare in C
+    # without per-combo tuple allocations, which dominates this phase
+    for drawn in sorted_drawn:
+        for combo in combinations(drawn, pattern_size):
+            counter.add(_pack_pattern(combo))
+
+    pattern_frequency = counter.counts
+    if counter.evicted:
+        # Sketch counts are underestimates once keys have been evicted, so
+        # recount the survivors exactly before thresholding
+        survivors = set(pattern_frequency)
+        pattern_frequency = defaultdict(int)
+        for drawn in sorted_drawn:
+            for combo in combinations(drawn, pattern_size):
+                key = _pack_pattern(combo)
+                if key in survivors:
+                    pattern_frequency[key] += 1
+
     # Only analyze patterns that appear at least min_occurrences times
-    frequent_patterns = {p for p, count in pattern_frequency.items() if count >= min_occurrences}
+    frequent_patterns = {
+        _unpack_pattern(key, pattern_size)
+        for key, count in pattern_frequency.items() if count >= min_occurrences
+    }
     
-    print(f"Found {len(pattern_frequency)} unique patterns")
+    if counter.evicted:
+        print(f"Tracking {len(pattern_frequency)} candidate patterns (cap: {MAX_TRACKED_PATTERNS})")
+    else:
+        print(f"Found {len(pattern_frequency)} unique patterns")
     print(f"Filtering to {len(frequent_patterns)} patterns with >={min_occurrences} appearances")
-    print(f"\nPhase 2: Analyzing completion behavior across {len(history)} rounds...")
-    
-    # Pre-compute drawn sets for faster lookups
-    drawn_sets = [set(bet.get('drawn', [])) for bet in history]
-    
-    pattern_stats = {}
-    
-    for pattern in frequent_patterns:
-        pattern_set = set(pattern)
-        hit_sequence = []  # Track hits over time: [2, 3, 4, 5, 3, 5, 2, ...]
-        completion_rounds = []  # Rounds where it hit fully
-        
-        for round_idx, drawn_set in enumerate(drawn_sets):
-            hits = len(pattern_set & drawn_set)
-            hit_sequence.append((round_idx, hits))
-            
-            if hits == pattern_size:
-                completion_rounds.append(round_idx)
-        
-        # Calculate metrics
-        total_completions = len(completion_rounds)
-        near_misses = sum(1 for _, hits in hit_sequence if hits >= pattern_size - 1 and hits < pattern_size)
-        partial_hits = sum(1 for _, hits in hit_sequence if hits >= pattern_size - 2 and hits < pattern_size)
-        
-        # Find buildups before first completion
-        buildups_before_first = []
-        if completion_rounds:
-            first_completion = completion_rounds[0]
-            for round_idx, hits in hit_sequence:
-                if round_idx < first_completion and hits >= pattern_size - 2:
-                    buildups_before_first.append(hits)
-        
-        # Calculate time between consecutive completions
-        completion_gaps = []
-        if len(completion_rounds) > 1:
-            for i in range(1, len(completion_rounds)):
-                gap = completion_rounds[i] - completion_rounds[i-1]
-                completion_gaps.append(gap)
-        
-        pattern_stats[pattern] = {
-            'completions': total_completions,
-            'near_misses': near_misses,
-            'partial_hits': partial_hits,
-            'buildups_before_first': len(buildups_before_first),
-            'avg_buildup_hits': sum(buildups_before_first) / len(buildups_before_first) if buildups_before_first else 0,
-            'completion_gaps': completion_gaps,
-            'avg_gap': sum(completion_gaps) / len(completion_gaps) if completion_gaps else 0,
-            'min_gap': min(completion_gaps) if completion_gaps else 0,
-            'tease_ratio': near_misses / max(total_completions, 1)  # High ratio = teaser pattern
-        }
-    
+    print(f"\nPhase 2: Analyzing completion behavior across {view.n_rounds} rounds...")
+
+    # One int bitmask per round: the intersection size becomes a single
+    # AND + hardware POPCNT instead of ~20 hash probes per check
+    round_masks = view.drawn_masks
+
+    pattern_list = sorted(frequent_patterns)
+    pattern_masks = [reduce(or_, (1 << n for n in pattern), 0) for pattern in pattern_list]
+    round_mask_arr = np.asarray(round_masks, dtype=np.int64)
+
+    if _scan_patterns_jit is not None and pattern_list:
+        agg = _scan_patterns_jit(
+            round_mask_arr,
+            np.asarray(pattern_masks, dtype=np.int64),
+            pattern_size,
+        )
+    elif len(pattern_masks) * len(round_masks) >= PARALLEL_SCAN_MIN_WORK:
+        agg = _scan_patterns_parallel(round_masks, pattern_masks, pattern_size)
+    else:
+        agg = _scan_patterns_py(round_masks, pattern_masks, pattern_size)
+    completions, near, partial, buildup_cnt, buildup_sum, gap_sum, gap_cnt, gap_min, quick = agg
+
+    # Keep the per-pattern stats as parallel arrays (struct-of-arrays); the
+    # category filters below become boolean masks instead of dict scans
+    completions = np.asarray(completions, dtype=np.int64)
+    near = np.asarray(near, dtype=np.int64)
+    partial = np.asarray(partial, dtype=np.int64)
+    buildup_cnt = np.asarray(buildup_cnt, dtype=np.int64)
+    gap_cnt = np.asarray(gap_cnt, dtype=np.int64)
+    gap_min = np.asarray(gap_min, dtype=np.int64)
+    gap_sum = np.asarray(gap_sum, dtype=np.int64)
+    quick = np.asarray(quick, dtype=np.int64)
+    tease_ratio = near / np.maximum(completions, 1)  # High ratio = teaser pattern
+    avg_gap = gap_sum / np.maximum(gap_cnt, 1)
+
     # Filter patterns with enough data
-    filtered_patterns = {k: v for k, v in pattern_stats.items() if v['near_misses'] + v['completions'] >= min_occurrences}
-    
-    print(f"Filtered to {len(filtered_patterns)} patterns with at least {min_occurrences} near-misses or completions\n")
-    
+    filtered = (near + completions) >= min_occurrences
+
+    print(f"Filtered to {int(filtered.sum())} patterns with at least {min_occurrences} near-misses or completions\n")
+
     # Debug: Show distribution of metrics
-    if filtered_patterns:
-        all_tease_ratios = [s['tease_ratio'] for s in filtered_patterns.values()]
-        all_completions = [s['completions'] for s in filtered_patterns.values()]
-        print(f"Tease ratio range: {min(all_tease_ratios):.1f} - {max(all_tease_ratios):.1f}")
-        print(f"Completions range: {min(all_completions)} - {max(all_completions)}")
+    if filtered.any():
+        print(f"Tease ratio range: {tease_ratio[filtered].min():.1f} - {tease_ratio[filtered].max():.1f}")
+        print(f"Completions range: {completions[filtered].min()} - {completions[filtered].max()}")
         print()
+
+    def top_rows(mask, *sort_keys, k=15):
+        """Indices of the k best masked rows, ordered by the descending sort
+        keys (primary first) with index order breaking ties, matching what a
+        stable descending sort of the old dict entries produced."""
+        cand = np.flatnonzero(mask)
+        if cand.size == 0:
+            return cand
+        keys = (cand,) + tuple(-key[cand] for key in reversed(sort_keys))
+        return cand[np.lexsort(keys)[:min(k, cand.size)]]
     
     # Category 1: TEASER PATTERNS (lots of near-misses, few completions)
     print("="*80)
@@ -342,17 +610,15 @@ def analyze_pattern_completion_behavior(history, pattern_size=5, min_occurrences
     print("="*80)
     print("These patterns frequently hit 3/5 or 4/5 but rarely complete - AVOID CHASING\n")
     
-    teasers = sorted(
-        [(p, s) for p, s in filtered_patterns.items() if s['tease_ratio'] >= 6 and s['completions'] <= 11],
-        key=lambda x: x[1]['tease_ratio'],
-        reverse=True
-    )[:15]
-    
-    for pattern, stats in teasers:
-        print(f"Pattern {list(pattern)}:")
-        print(f"  Near-misses: {stats['near_misses']} | Completions: {stats['completions']} | Tease Ratio: {stats['tease_ratio']:.1f}x")
-        print(f"  Total partial hits (3-4/5): {stats['partial_hits']}")
-        print()
+    teasers = top_rows(filtered & (tease_ratio >= 6) & (completions <= 11), tease_ratio)
+
+    out = []
+    for i in teasers:
+        out.append(f"Pattern {list(pattern_list[i])}:")
+        out.append(f"  Near-misses: {near[i]} | Completions: {completions[i]} | Tease Ratio: {tease_ratio[i]:.1f}x")
+        out.append(f"  Total partial hits (3-4/5): {partial[i]}")
+        out.append("")
+    _emit(out)
     
     # Category 2: MOMENTUM BUILDERS (build up and then hit multiple times)
     print("="*80)
@@ -360,21 +626,20 @@ def analyze_pattern_completion_behavior(history, pattern_size=5, min_occurrences
     print("="*80)
     print("These patterns show buildup (3->4->5) and hit multiple times quickly after first completion\n")
     
-    builders = sorted(
-        [(p, s) for p, s in filtered_patterns.items() 
-         if s['completions'] >= 11 and s['buildups_before_first'] >= 5 and s['avg_gap'] > 0],
-        key=lambda x: (x[1]['completions'], -x[1]['avg_gap']),
-        reverse=True
-    )[:15]
-    
-    for pattern, stats in builders:
-        print(f"Pattern {list(pattern)}:")
-        print(f"  Completions: {stats['completions']} | Buildups before 1st: {stats['buildups_before_first']}")
-        print(f"  Avg gap between completions: {stats['avg_gap']:.1f} rounds | Min gap: {stats['min_gap']}")
-        if stats['completion_gaps']:
-            quick_hits = sum(1 for gap in stats['completion_gaps'] if gap <= 50)
-            print(f"  Quick succession hits (<=50 rounds): {quick_hits}/{len(stats['completion_gaps'])}")
-        print()
+    builders = top_rows(
+        filtered & (completions >= 11) & (buildup_cnt >= 5) & (avg_gap > 0),
+        completions, -avg_gap
+    )
+
+    out = []
+    for i in builders:
+        out.append(f"Pattern {list(pattern_list[i])}:")
+        out.append(f"  Completions: {completions[i]} | Buildups before 1st: {buildup_cnt[i]}")
+        out.append(f"  Avg gap between completions: {avg_gap[i]:.1f} rounds | Min gap: {gap_min[i]}")
+        if gap_cnt[i]:
+            out.append(f"  Quick succession hits (<=50 rounds): {quick[i]}/{gap_cnt[i]}")
+        out.append("")
+    _emit(out)
     
     # Category 3: CONSISTENT PERFORMERS (moderate completions, low tease ratio)
     print("="*80)
@@ -382,46 +647,41 @@ def analyze_pattern_completion_behavior(history, pattern_size=5, min_occurrences
     print("="*80)
     print("These patterns complete regularly without excessive teasing\n")
     
-    consistent = sorted(
-        [(p, s) for p, s in filtered_patterns.items() 
-         if s['completions'] >= 10 and s['tease_ratio'] <= 5],
-        key=lambda x: x[1]['completions'],
-        reverse=True
-    )[:15]
-    
-    for pattern, stats in consistent:
-        completion_rate = stats['completions'] / (stats['near_misses'] + stats['completions']) * 100
-        print(f"Pattern {list(pattern)}:")
-        print(f"  Completions: {stats['completions']} | Near-misses: {stats['near_misses']} | Tease Ratio: {stats['tease_ratio']:.1f}x")
-        print(f"  Completion rate: {completion_rate:.1f}%")
-        print()
+    consistent = top_rows(filtered & (completions >= 10) & (tease_ratio <= 5), completions)
+
+    out = []
+    for i in consistent:
+        completion_rate = completions[i] / (near[i] + completions[i]) * 100
+        out.append(f"Pattern {list(pattern_list[i])}:")
+        out.append(f"  Completions: {completions[i]} | Near-misses: {near[i]} | Tease Ratio: {tease_ratio[i]:.1f}x")
+        out.append(f"  Completion rate: {completion_rate:.1f}%")
+        out.append("")
+    _emit(out)
     
     print("="*80)
     print("TIMING ANALYSIS: When to Chase vs Avoid")
     print("="*80)
     print("\nAnalyzing buildup windows before completions...\n")
     
-    # Analyze buildup windows for all patterns
+    # Analyze buildup windows for all patterns. For each pattern, the whole
+    # hit sequence comes from one vectorized popcount, and the length of the
+    # consecutive buildup-zone run ending before each completion falls out
+    # of a cumulative-sum run-length trick instead of a per-round lookback.
     buildup_windows = []
-    for pattern, stats in filtered_patterns.items():
-        pattern_set = set(pattern)
-        
-        # For each completion, look back to find when buildup started
-        for round_idx, drawn_set in enumerate(drawn_sets):
-            hits = len(pattern_set & drawn_set)
-            if hits == pattern_size:  # This is a completion
-                # Look back up to 50 rounds to find buildup
-                buildup_start = None
-                for lookback in range(1, min(51, round_idx + 1)):
-                    prev_round = round_idx - lookback
-                    prev_hits = len(pattern_set & drawn_sets[prev_round])
-                    if prev_hits >= pattern_size - 2:  # 3/5 or 4/5
-                        buildup_start = lookback
-                    else:
-                        break  # No longer in buildup zone
-                
-                if buildup_start:
-                    buildup_windows.append(buildup_start)
+    for i in np.flatnonzero(filtered):
+        hits = np.bitwise_count(round_mask_arr & pattern_masks[i])
+        in_zone = hits >= pattern_size - 2  # 3/5 or 4/5 (or complete)
+
+        # run[t] = number of consecutive in-zone rounds ending at t
+        csum = np.cumsum(in_zone)
+        run = csum - np.maximum.accumulate(np.where(in_zone, 0, csum))
+
+        completions_at = np.flatnonzero(hits == pattern_size)
+        completions_at = completions_at[completions_at > 0]
+        if completions_at.size:
+            # Look back at most 50 rounds from each completion
+            windows = np.minimum(run[completions_at - 1], 50)
+            buildup_windows.extend(int(w) for w in windows[windows > 0])
     
     if buildup_windows:
         avg_window = sum(buildup_windows) / len(buildup_windows)
@@ -430,10 +690,11 @@ def analyze_pattern_completion_behavior(history, pattern_size=5, min_occurrences
         
         # Find most common windows
         window_counts = Counter(buildup_windows)
-        print("\nMost common buildup lengths:")
+        out = ["\nMost common buildup lengths:"]
         for window, count in window_counts.most_common(10):
             pct = (count / len(buildup_windows)) * 100
-            print(f"  {window} rounds: {count} times ({pct:.1f}%)")
+            out.append(f"  {window} rounds: {count} times ({pct:.1f}%)")
+        _emit(out)
     
     print("\n" + "="*80)
     print("RECOMMENDATIONS FOR LIVE PATTERN TOOL")
@@ -457,16 +718,16 @@ def main():
     print(f"\nLoading data from: {file_path}")
     
     try:
-        history = load_history(file_path)
-        print(f"Loaded {len(history)} rounds of history")
-        
+        view = load_history(file_path)
+        print(f"Loaded {view.n_rounds} rounds of history")
+
         # Run all analyses
-        analyze_number_appearance_order(history)
-        analyze_hot_cold_streaks(history)
-        analyze_pattern_before_rare_numbers(history)
-        analyze_completion_patterns(history)
-        find_predictive_patterns(history)
-        analyze_pattern_completion_behavior(history, pattern_size=5, min_occurrences=10)
+        analyze_number_appearance_order(view)
+        analyze_hot_cold_streaks(view)
+        analyze_pattern_before_rare_numbers(view)
+        analyze_completion_patterns(view)
+        find_predictive_patterns(view)
+        analyze_pattern_completion_behavior(view, pattern_size=5, min_occurrences=10)
         
         print("\n" + "="*80)
         print("ANALYSIS COMPLETE")
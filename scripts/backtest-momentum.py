@@ -45,13 +45,31 @@ OUTPUT:
   Results saved to: scripts/output/momentum-results-{timestamp}.json
 """
 
+import io
 import json
+import os
 import sys
+import warnings
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
-from collections import defaultdict
 import time
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_rng = np.random.default_rng()
+
 def load_bet_multis():
     """Load bet multiplier config for profitability calculations"""
     multis_file = Path(__file__).parent.parent / 'config' / 'bet-multis.json'
@@ -60,8 +78,12 @@ def load_bet_multis():
 
 def load_history(filepath):
     """Load Keno game history from JSON file"""
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    with open(filepath, 'rb') as f:
+        data = f.read()
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 def get_drawn_numbers(round_data):
     """Extract drawn numbers from round data"""
@@ -70,13 +92,175 @@ def get_drawn_numbers(round_data):
     # Fallback: combine hits and misses
     return sorted(round_data.get('hits', []) + round_data.get('misses', []))
 
+def _round_to_mask(round_data):
+    """Bitmask of a round's drawn numbers (bit n-1 = number n)"""
+    drawn = round_data.get('drawn')
+    if drawn is None:
+        # Fallback: combine hits and misses (older capture format; order is
+        # irrelevant for the mask)
+        warnings.warn(
+            "round data without a 'drawn' field; reconstructing from hits + misses",
+            DeprecationWarning, stacklevel=2
+        )
+        drawn = round_data.get('hits', []) + round_data.get('misses', [])
+
+    mask = 0
+    for n in drawn:
+        mask |= 1 << (n - 1)
+    return mask
+
+def _history_length(history):
+    """Round count of a history argument.
+
+    Callers that work purely off the precomputed arrays pass the round
+    count itself instead of a list of round dicts; the raw dicts are only
+    needed by the legacy per-round fallback paths.
+    """
+    return history if isinstance(history, int) else len(history)
+
+def _pattern_to_mask(pattern):
+    """Bitmask of a pattern's numbers (bit n-1 = number n)"""
+    mask = 0
+    for n in pattern:
+        mask |= 1 << (n - 1)
+    return mask
+
+def _mask_to_numbers(mask):
+    """Sorted number list from a pattern bitmask (bit n-1 = number n)"""
+    return [n for n in range(1, 41) if mask >> (n - 1) & 1]
+
+def build_masks(history):
+    """Per-round drawn-number bitmasks for the whole history.
+
+    With numbers confined to 1..40, membership / intersection / subset
+    checks against a round collapse to single bitwise ops on a uint64.
+    """
+    return np.fromiter((_round_to_mask(r) for r in history), dtype=np.uint64, count=len(history))
+
+def build_bits(masks):
+    """(rounds, 40) 0/1 matrix unpacked from the mask array.
+
+    Column n-1 marks number n, so window counts for all 40 numbers are one
+    C-level column sum instead of 40 Python membership scans.
+    """
+    return np.unpackbits(
+        masks.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little'
+    )[:, :40]
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False, nogil=True)
+    def _backtest_chunk(cum, masks, idxs,
+                        have_pattern, cur_mask, last_mask,
+                        dw, bw, threshold, refresh, top_n, psize, lookahead,
+                        multi_row, track):
+        """Compiled steady-state backtest loop over one chunk of refresh points.
+
+        Mirrors the Python path exactly: prefix-sum window counts, momentum
+        ranking with ties broken by ascending number, frequency fallback
+        fill, and mask-based pattern evaluation. State scalars are threaded
+        in and out so chunks can be stitched together with progress prints
+        in between.
+        """
+        n = idxs.shape[0]
+        completed = np.zeros(n, np.uint8)
+        rounds_to_hit = np.zeros(n, np.int32)
+        profits = np.zeros(n, np.float64)
+        baseline = np.empty(40, np.int64)
+        changes = 0
+
+        for j in range(n):
+            idx = idxs[j]
+
+            if have_pattern == 0 or idx % refresh == 0:
+                # Window counts are prefix-sum differences; momentum math and
+                # the zero-baseline edge case match momentum_from_counts
+                momentum = np.empty(40, np.float64)
+                for i in range(40):
+                    recent_i = cum[idx, i] - cum[idx - dw, i]
+                    baseline[i] = cum[idx, i] - cum[idx - bw, i]
+                    if baseline[i] == 0:
+                        momentum[i] = 999.0 if recent_i > 0 else 0.0
+                    else:
+                        momentum[i] = (recent_i / dw) / (baseline[i] / bw)
+
+                # Pick hot numbers: momentum desc, ties by ascending number
+                used = np.zeros(40, np.uint8)
+                chosen_mask = 0
+                chosen = 0
+                limit = min(psize, top_n)
+                for _ in range(limit):
+                    best_i = -1
+                    best_m = -1.0
+                    for i in range(40):
+                        if used[i] == 0 and momentum[i] >= threshold and momentum[i] > best_m:
+                            best_m = momentum[i]
+                            best_i = i
+                    if best_i < 0:
+                        break
+                    used[best_i] = 1
+                    chosen_mask |= 1 << best_i
+                    chosen += 1
+
+                # Fill gaps with most frequent baseline numbers (freq desc,
+                # ties by ascending number)
+                while chosen < psize:
+                    best_i = -1
+                    best_f = -1
+                    for i in range(40):
+                        if used[i] == 0 and baseline[i] > best_f:
+                            best_f = baseline[i]
+                            best_i = i
+                    used[best_i] = 1
+                    chosen_mask |= 1 << best_i
+                    chosen += 1
+
+                cur_mask = chosen_mask
+                have_pattern = 1
+
+            if cur_mask != last_mask:
+                changes += 1
+                last_mask = cur_mask
+
+            # Evaluate the pattern over the lookahead window
+            profit = 0.0
+            hit = 0
+            for k in range(1, lookahead + 1):
+                inter = masks[idx + k - 1] & cur_mask
+                if inter == cur_mask:
+                    hit = 1
+                    rounds_to_hit[j] = k
+                    if track:
+                        profit = multi_row[psize] - k
+                    break
+
+            if hit == 0 and track:
+                profit = -1.0 * lookahead
+                for k in range(1, lookahead + 1):
+                    x = masks[idx + k - 1] & cur_mask
+                    # SWAR popcount: numba has no int.bit_count
+                    x = x - ((x >> 1) & 0x5555555555555555)
+                    x = (x & 0x3333333333333333) + ((x >> 2) & 0x3333333333333333)
+                    x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0F
+                    hits = (x * 0x0101010101010101) >> 56
+                    if hits > 0 and multi_row[hits] > 0:
+                        p = multi_row[hits] - k
+                        if p > profit:
+                            profit = p
+
+            completed[j] = hit
+            profits[j] = profit
+
+        return completed, rounds_to_hit, profits, changes, have_pattern, cur_mask, last_mask
+else:
+    _backtest_chunk = None
+
 class MomentumPatternGenerator:
     """
     Momentum-based pattern generator
     Identifies numbers with acceleration above baseline frequency
     """
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, bits=None):
         self.config = config or {
             'pattern_size': 10,
             'detection_window': 5,
@@ -85,60 +269,92 @@ class MomentumPatternGenerator:
             'refresh_frequency': 5,
             'top_n_pool': 15
         }
-        self.current_pattern = []
+        self.bits = bits  # optional (rounds, 40) matrix from build_bits
+        self.current_mask = 0
         self.last_refresh_round = 0
-    
-    def get_pattern(self, history, current_round_number):
+
+    def get_pattern(self, history, current_round_number, recent_counts=None, baseline_counts=None):
         """
-        Main entry point - returns pattern for current round
+        Main entry point - returns the pattern bitmask for current round
         Auto-refreshes based on refresh_frequency
         """
         # Check if we need to refresh
         should_refresh = (
-            len(self.current_pattern) == 0 or  # First time
+            self.current_mask == 0 or  # First time
             current_round_number % self.config['refresh_frequency'] == 0  # Time to refresh
         )
-        
+
         if should_refresh:
             # Ensure minimum history available
-            if len(history) < self.config['baseline_window']:
-                return self.get_fallback_pattern(history)
-            
+            if _history_length(history) < self.config['baseline_window']:
+                return _pattern_to_mask(self.get_fallback_pattern(history))
+
             # Generate new pattern
-            self.current_pattern = self.generate_pattern(history)
+            self.current_mask = self.generate_pattern(history, recent_counts, baseline_counts)
             self.last_refresh_round = current_round_number
-        
-        return self.current_pattern
-    
-    def generate_pattern(self, history):
-        """Generate pattern from hot numbers"""
-        hot_numbers = self.identify_hot_numbers(history)
+
+        return self.current_mask
+
+    def generate_pattern(self, history, recent_counts=None, baseline_counts=None):
+        """Generate a pattern bitmask from hot numbers"""
+        hot_numbers = self.identify_hot_numbers(history, recent_counts, baseline_counts)
         top_candidates = hot_numbers[:self.config['top_n_pool']]
-        
-        pattern = [item['number'] for item in top_candidates[:self.config['pattern_size']]]
-        
+
+        pattern = top_candidates[:self.config['pattern_size']]
+
         # Fill gaps if not enough hot numbers
         if len(pattern) < self.config['pattern_size']:
             fallback = self.get_most_frequent_numbers(
                 history,
                 self.config['pattern_size'] - len(pattern),
-                pattern
+                pattern,
+                baseline_counts
             )
             pattern.extend(fallback)
-        
-        return sorted(pattern)
-    
-    def identify_hot_numbers(self, history):
-        """Identify all hot numbers sorted by momentum"""
+
+        return _pattern_to_mask(pattern)
+    
+    def identify_hot_numbers(self, history, recent_counts=None, baseline_counts=None):
+        """Hot numbers (1-40) sorted by momentum, hottest first"""
+        if recent_counts is not None:
+            momentum = self.momentum_from_counts(recent_counts, baseline_counts)
+        elif self.bits is not None:
+            momentum = self.momentum_vector(_history_length(history))
+        else:
+            momentum = None
+
+        if momentum is not None:
+            # Stable descending sort keeps equal-momentum numbers in
+            # ascending number order, same as the per-number loop
+            order = np.argsort(-momentum, kind='stable')
+            hot = order[momentum[order] >= self.config['momentum_threshold']]
+            return (hot + 1).tolist()
+
         hot_numbers = []
-        
+
         for number in range(1, 41):
             momentum = self.calculate_momentum(number, history)
-            
+
             if momentum is not None and momentum >= self.config['momentum_threshold']:
-                hot_numbers.append({'number': number, 'momentum': momentum})
-        
-        return sorted(hot_numbers, key=lambda x: x['momentum'], reverse=True)
+                hot_numbers.append((number, momentum))
+
+        hot_numbers.sort(key=lambda x: x[1], reverse=True)
+        return [number for number, _ in hot_numbers]
+
+    def momentum_vector(self, end):
+        """Momentum for all 40 numbers at once from the bit matrix"""
+        recent = self.bits[end - self.config['detection_window']:end].sum(0)
+        baseline = self.bits[end - self.config['baseline_window']:end].sum(0)
+        return self.momentum_from_counts(recent, baseline)
+
+    def momentum_from_counts(self, recent, baseline):
+        """Momentum for all 40 numbers from precomputed window counts"""
+        recent_freq = recent / self.config['detection_window']
+        baseline_freq = baseline / self.config['baseline_window']
+
+        # Same edge case as calculate_momentum: never in baseline -> 999/0
+        ratio = recent_freq / np.where(baseline_freq == 0, 1, baseline_freq)
+        return np.where(baseline == 0, np.where(recent > 0, 999.0, 0.0), ratio)
     
     def calculate_momentum(self, number, history):
         """
@@ -168,39 +384,54 @@ class MomentumPatternGenerator:
         # Calculate momentum ratio
         return recent_freq / baseline_freq
     
-    def get_most_frequent_numbers(self, history, count, exclude=None):
+    def get_most_frequent_numbers(self, history, count, exclude=None, baseline_counts=None):
         """Get most frequent numbers from baseline as fallback"""
         if exclude is None:
             exclude = []
-        
-        frequencies = {i: 0 for i in range(1, 41)}
-        
+
+        if baseline_counts is None and self.bits is not None:
+            end = _history_length(history)
+            start = max(end - self.config['baseline_window'], 0)
+            baseline_counts = self.bits[start:end].sum(0)
+
+        if baseline_counts is not None:
+            numbers = np.arange(1, 41)
+            counts = np.asarray(baseline_counts)
+            if exclude:
+                keep = ~np.isin(numbers, exclude)
+                numbers = numbers[keep]
+                counts = counts[keep]
+            # Stable descending sort keeps equal-count numbers in
+            # ascending number order, same as the dict-based loop
+            order = np.argsort(-counts, kind='stable')
+            return numbers[order[:count]].tolist()
+
+        frequencies = np.zeros(41, np.int64)
+
         baseline_rounds = history[-self.config['baseline_window']:]
         for round_data in baseline_rounds:
             for num in get_drawn_numbers(round_data):
                 frequencies[num] += 1
-        
+
         sorted_nums = sorted(
-            [(num, freq) for num, freq in frequencies.items() if num not in exclude],
+            [(num, frequencies[num]) for num in range(1, 41) if num not in exclude],
             key=lambda x: x[1],
             reverse=True
         )
-        
+
         return [num for num, freq in sorted_nums[:count]]
     
     def get_fallback_pattern(self, history):
         """Fallback when not enough history"""
-        if len(history) == 0:
+        if _history_length(history) == 0:
             return self.get_random_pattern()
         
         return self.get_most_frequent_numbers(history, self.config['pattern_size'], [])
     
     def get_random_pattern(self):
         """Generate random pattern as last resort"""
-        import random
-        numbers = list(range(1, 41))
-        random.shuffle(numbers)
-        return sorted(numbers[:self.config['pattern_size']])
+        picks = _rng.choice(40, size=self.config['pattern_size'], replace=False)
+        return np.sort(picks + 1).tolist()
     
     def get_all_momentum_values(self, history):
         """Get momentum values for all 40 numbers"""
@@ -215,58 +446,65 @@ class MomentumPatternGenerator:
         return sorted(results, key=lambda x: x['momentum'] or 0, reverse=True)
 
 
-def evaluate_pattern_performance(history, pattern, lookahead_rounds, bet_multis=None, difficulty='high'):
+def build_multi_row(bet_multis, difficulty, pattern_size):
+    """
+    Flatten the nested bet multiplier config into a per-hits lookup row:
+    row[hits] is the multiplier for that many hits at this difficulty and
+    pattern size. Returns None when profitability is not being tracked.
+    """
+    if not bet_multis:
+        return None
+
+    size_multis = bet_multis.get(difficulty, {}).get(str(pattern_size), {})
+    row = np.zeros(41, np.float64)
+    for hits in range(pattern_size + 1):
+        row[hits] = size_multis.get(str(hits), 0)
+    return row
+
+
+def evaluate_pattern_performance(future_masks, pattern_mask, pattern_size, lookahead_rounds, multi_row=None):
     """
     Evaluate if pattern completed in next lookahead_rounds
     Returns: (completed, rounds_to_hit, profit)
     """
-    if lookahead_rounds > len(history):
+    if lookahead_rounds > len(future_masks):
         return False, 0, 0
-    
-    future_rounds = history[:lookahead_rounds]
-    pattern_set = set(pattern)
-    
-    # Check if pattern completes
-    for rounds_ahead, round_data in enumerate(future_rounds, 1):
-        drawn = set(get_drawn_numbers(round_data))
-        hits = len(pattern_set.intersection(drawn))
-        
-        # Check for full completion
-        if pattern_set.issubset(drawn):
-            profit = 0
-            if bet_multis:
-                pattern_size = len(pattern)
-                multiplier = bet_multis.get(difficulty, {}).get(str(pattern_size), {}).get(str(pattern_size), 0)
-                profit = multiplier - rounds_ahead
-            
-            return True, rounds_ahead, profit
-    
-    # Pattern didn't complete - check for best partial hit if tracking maintaining
-    if bet_multis:
-        best_profit = -lookahead_rounds  # Worst case: lose all rounds
-        
-        for rounds_ahead, round_data in enumerate(future_rounds, 1):
-            drawn = set(get_drawn_numbers(round_data))
-            hits = len(pattern_set.intersection(drawn))
-            
-            if hits > 0:
-                pattern_size = len(pattern)
-                multiplier = bet_multis.get(difficulty, {}).get(str(pattern_size), {}).get(str(hits), 0)
-                if multiplier > 0:
-                    profit = multiplier - rounds_ahead
-                    best_profit = max(best_profit, profit)
-        
-        return False, 0, best_profit
-    
+
+    # Hits per future round in one shot; the pattern completes exactly when
+    # all of its pattern_size bits are drawn
+    window = future_masks[:lookahead_rounds]
+    hits = np.bitwise_count(window & np.uint64(pattern_mask)).astype(np.int64)
+
+    complete = np.flatnonzero(hits == pattern_size)
+    if complete.size:
+        rounds_ahead = int(complete[0]) + 1
+        profit = 0
+        if multi_row is not None:
+            profit = multi_row[pattern_size] - rounds_ahead
+
+        return True, rounds_ahead, profit
+
+    if multi_row is not None:
+        rounds_ahead = np.arange(1, lookahead_rounds + 1)
+        multipliers = multi_row[hits]
+        # Worst case: lose all rounds
+        round_profits = np.where((hits > 0) & (multipliers > 0),
+                                 multipliers - rounds_ahead, -lookahead_rounds)
+        return False, 0, round_profits.max()
+
     return False, 0, 0
 
 
-def run_backtest(history, config, bet_multis=None, difficulty='high', verbose=False):
+def run_backtest(masks, bits, config, bet_multis=None, difficulty='high', verbose=False):
     """
-    Backtest momentum strategy across historical data
+    Backtest momentum strategy across historical data.
+
+    Takes the precomputed mask array and bit matrix (see build_masks /
+    build_bits) so a single conversion of the dataset serves every run.
     """
-    generator = MomentumPatternGenerator(config)
-    
+    n_rounds = len(masks)
+    generator = MomentumPatternGenerator(config, bits=bits)
+
     lookahead = 30  # Check if pattern completes in next 30 rounds
     start_idx = config['baseline_window'] + 100  # Need baseline + buffer
     
@@ -278,52 +516,150 @@ def run_backtest(history, config, bet_multis=None, difficulty='high', verbose=Fa
     
     # Track pattern changes
     pattern_changes = 0
-    last_pattern = []
-    
+
     print(f"\n{'='*80}")
     print(f"BACKTESTING MOMENTUM STRATEGY")
     print(f"{'='*80}")
     print(f"Config: pattern_size={config['pattern_size']}, detection={config['detection_window']}, "
           f"baseline={config['baseline_window']}, threshold={config['momentum_threshold']}")
-    print(f"Dataset: {len(history)} rounds, testing from round {start_idx}")
+    print(f"Dataset: {n_rounds} rounds, testing from round {start_idx}")
     print(f"{'='*80}\n")
     
-    # Evaluate every refresh_frequency rounds
-    for current_idx in range(start_idx, len(history) - lookahead, config['refresh_frequency']):
-        # Get history up to this point
-        history_slice = history[:current_idx]
-        
-        # Get pattern for this round
-        pattern = generator.get_pattern(history_slice, current_idx)
-        
-        # Track pattern changes
-        if pattern != last_pattern:
-            pattern_changes += 1
-            last_pattern = pattern.copy()
-            if verbose:
-                print(f"Round {current_idx}: New pattern {pattern}")
-        
-        # Evaluate performance
-        future_history = history[current_idx:]
-        completed, rounds, profit = evaluate_pattern_performance(
-            future_history, pattern, lookahead, bet_multis, difficulty
-        )
-        
-        total_predictions += 1
-        
-        if completed:
-            total_completions += 1
-            rounds_to_hit.append(rounds)
-        
-        if bet_multis:
-            profits.append(profit)
-            if profit >= 0:
-                total_maintaining += 1
-        
-        # Progress update every 50 evaluations
-        if total_predictions % 50 == 0:
-            progress = (current_idx - start_idx) / (len(history) - lookahead - start_idx) * 100
-            print(f"Progress: {progress:.1f}% ({total_predictions} evaluations)")
+    # Prefix sums over the bit matrix: cum[r] counts each number's hits in
+    # rounds [0, r), so any window count is a difference of two rows
+    dw = config['detection_window']
+    bw = config['baseline_window']
+    cum = np.zeros((n_rounds + 1, 40), np.int64)
+    np.cumsum(bits, axis=0, out=cum[1:])
+
+    # Flat multiplier lookup, built once per run instead of chasing
+    # string-keyed dicts inside the evaluation loop
+    multi_row = build_multi_row(bet_multis, difficulty, config['pattern_size'])
+
+    # Compiled fast path: the whole loop runs inside a numba kernel, chunked
+    # by 50 evaluations so the progress prints below still appear on schedule.
+    # Verbose mode needs per-round pattern prints, so it stays on the
+    # Python path.
+    if _backtest_chunk is not None and not verbose:
+        track = multi_row is not None
+        masks_i64 = masks.view(np.int64)
+        eval_idxs = np.arange(start_idx, n_rounds - lookahead,
+                              config['refresh_frequency'], dtype=np.int64)
+        have_pattern = 0
+        cur_mask = 0
+        last_mask = 0
+        kernel_multis = multi_row if track else np.zeros(41, np.float64)
+
+        for lo in range(0, len(eval_idxs), 50):
+            chunk = eval_idxs[lo:lo + 50]
+            (done, rnds, prof, changes, have_pattern,
+             cur_mask, last_mask) = _backtest_chunk(
+                cum, masks_i64, chunk,
+                have_pattern, cur_mask, last_mask,
+                dw, bw, config['momentum_threshold'], config['refresh_frequency'],
+                config['top_n_pool'], config['pattern_size'], lookahead,
+                kernel_multis, track
+            )
+            pattern_changes += changes
+            total_predictions += len(chunk)
+            total_completions += int(done.sum())
+            rounds_to_hit.extend(int(r) for r in rnds[done == 1])
+            if track:
+                profits.extend(prof.tolist())
+                total_maintaining += int((prof >= 0).sum())
+
+            if len(chunk) == 50:
+                progress = (chunk[-1] - start_idx) / (n_rounds - lookahead - start_idx) * 100
+                print(f"Progress: {progress:.1f}% ({total_predictions} evaluations)")
+
+    elif not verbose:
+        # No numba: pattern generation is inherently sequential (patterns
+        # persist between refreshes), but evaluation is not. Collect the
+        # active mask per refresh point, then score every lookahead window
+        # in one vectorized pass.
+        eval_idxs = np.arange(start_idx, n_rounds - lookahead, config['refresh_frequency'])
+        pattern_masks = np.empty(len(eval_idxs), np.uint64)
+        pattern_mask = 0
+
+        for j, current_idx in enumerate(eval_idxs.tolist()):
+            recent_counts = cum[current_idx] - cum[current_idx - dw]
+            baseline_counts = cum[current_idx] - cum[current_idx - bw]
+            new_mask = generator.get_pattern(current_idx, current_idx, recent_counts, baseline_counts)
+            if new_mask != pattern_mask:
+                pattern_changes += 1
+                pattern_mask = new_mask
+            pattern_masks[j] = pattern_mask
+
+        if len(eval_idxs):
+            # (points, lookahead) hit counts in one shot
+            windows = np.lib.stride_tricks.sliding_window_view(masks, lookahead)[eval_idxs]
+            hits = np.bitwise_count(windows & pattern_masks[:, None]).astype(np.int64)
+            sizes = np.bitwise_count(pattern_masks).astype(np.int64)
+
+            complete = hits == sizes[:, None]
+            done = complete.any(axis=1)
+            first_hit = complete.argmax(axis=1) + 1
+
+            total_predictions = len(eval_idxs)
+            total_completions = int(done.sum())
+            rounds_to_hit = first_hit[done].tolist()
+
+            if multi_row is not None:
+                rounds_ahead = np.arange(1, lookahead + 1)
+                multipliers = multi_row[hits]
+                partial_best = np.where((hits > 0) & (multipliers > 0),
+                                        multipliers - rounds_ahead,
+                                        float(-lookahead)).max(axis=1)
+                profit_arr = np.where(done, multi_row[sizes] - first_hit, partial_best)
+                profits = profit_arr.tolist()
+                total_maintaining = int((profit_arr >= 0).sum())
+
+            # Same progress lines as the sequential loop, emitted after the
+            # fact at every 50th evaluation point
+            for j in range(49, total_predictions, 50):
+                progress = (eval_idxs[j] - start_idx) / (n_rounds - lookahead - start_idx) * 100
+                print(f"Progress: {progress:.1f}% ({j + 1} evaluations)")
+
+    else:
+        pattern_mask = 0
+
+        # Evaluate every refresh_frequency rounds
+        for current_idx in range(start_idx, n_rounds - lookahead, config['refresh_frequency']):
+            recent_counts = cum[current_idx] - cum[current_idx - dw]
+            baseline_counts = cum[current_idx] - cum[current_idx - bw]
+
+            # Get pattern mask for this round (the generator only needs the
+            # round count; the arrays carry the data)
+            new_mask = generator.get_pattern(current_idx, current_idx, recent_counts, baseline_counts)
+
+            # Track pattern changes
+            if new_mask != pattern_mask:
+                pattern_changes += 1
+                pattern_mask = new_mask
+                if verbose:
+                    print(f"Round {current_idx}: New pattern {_mask_to_numbers(pattern_mask)}")
+
+            # Evaluate performance
+            completed, rounds, profit = evaluate_pattern_performance(
+                masks[current_idx:current_idx + lookahead], pattern_mask,
+                pattern_mask.bit_count(), lookahead, multi_row
+            )
+
+            total_predictions += 1
+
+            if completed:
+                total_completions += 1
+                rounds_to_hit.append(rounds)
+
+            if multi_row is not None:
+                profits.append(profit)
+                if profit >= 0:
+                    total_maintaining += 1
+
+            # Progress update every 50 evaluations
+            if total_predictions % 50 == 0:
+                progress = (current_idx - start_idx) / (n_rounds - lookahead - start_idx) * 100
+                print(f"Progress: {progress:.1f}% ({total_predictions} evaluations)")
     
     # Calculate metrics
     success_rate = (total_completions / total_predictions * 100) if total_predictions > 0 else 0
@@ -366,7 +702,32 @@ def print_results(results):
     print(f"{'='*80}\n")
 
 
-def optimize_parameters(history, bet_multis=None, difficulty='high'):
+# Shared state for optimization workers, populated once per process via the
+# pool initializer so the dataset arrays are not re-pickled for every config
+_OPT_MASKS = None
+_OPT_BITS = None
+_OPT_BET_MULTIS = None
+_OPT_DIFFICULTY = 'high'
+
+
+def _init_optimize_worker(masks, bits, bet_multis, difficulty):
+    global _OPT_MASKS, _OPT_BITS, _OPT_BET_MULTIS, _OPT_DIFFICULTY
+    _OPT_MASKS = masks
+    _OPT_BITS = bits
+    _OPT_BET_MULTIS = bet_multis
+    _OPT_DIFFICULTY = difficulty
+
+
+def _run_config(config):
+    """Run one backtest config in a worker, capturing its printed output"""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        result = run_backtest(_OPT_MASKS, _OPT_BITS, config, _OPT_BET_MULTIS,
+                              _OPT_DIFFICULTY, verbose=False)
+    return result, buf.getvalue()
+
+
+def optimize_parameters(masks, bits, bet_multis=None, difficulty='high'):
     """Test multiple configurations to find optimal settings"""
     print(f"\n{'='*80}")
     print("OPTIMIZING MOMENTUM PARAMETERS")
@@ -390,16 +751,23 @@ def optimize_parameters(history, bet_multis=None, difficulty='high'):
     
     results = []
     total_tests = len(configs)
-    
+
     print(f"Testing {total_tests} configurations...\n")
     
-    for i, config in enumerate(configs, 1):
-        print(f"\n[TEST {i}/{total_tests}]")
-        result = run_backtest(history, config, bet_multis, difficulty, verbose=False)
-        results.append(result)
-        
-        print(f"Result: {result['success_rate']:.2f}% success, "
-              f"{result['avg_rounds_to_hit']:.1f} avg rounds")
+    # Configs are independent, so fan them out across processes. map() yields
+    # in submission order and each worker returns its captured prints, so the
+    # output reads exactly like the sequential version.
+    n_workers = min(os.cpu_count() or 1, total_tests)
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             initializer=_init_optimize_worker,
+                             initargs=(masks, bits, bet_multis, difficulty)) as pool:
+        for i, (result, captured) in enumerate(pool.map(_run_config, configs), 1):
+            print(f"\n[TEST {i}/{total_tests}]")
+            sys.stdout.write(captured)
+            results.append(result)
+
+            print(f"Result: {result['success_rate']:.2f}% success, "
+                  f"{result['avg_rounds_to_hit']:.1f} avg rounds")
     
     # Sort by success rate
     results.sort(key=lambda x: x['success_rate'], reverse=True)
@@ -462,7 +830,13 @@ def main():
         print(f"Limited to last {args.limit} rounds")
     
     print(f"Using {len(history)} rounds")
-    
+
+    # Convert once up front; everything downstream works off the arrays, so
+    # the raw round dicts can be released immediately
+    masks = build_masks(history)
+    bits = build_bits(masks)
+    del history
+
     # Load bet multipliers if needed
     bet_multis = None
     if args.track_maintaining:
@@ -471,7 +845,7 @@ def main():
     
     # Run optimization or single test
     if args.optimize:
-        results = optimize_parameters(history, bet_multis, args.difficulty)
+        results = optimize_parameters(masks, bits, bet_multis, args.difficulty)
         print_top_configs(results)
         
         # Save results
@@ -491,7 +865,7 @@ def main():
             'top_n_pool': args.top_n_pool
         }
         
-        results = run_backtest(history, config, bet_multis, args.difficulty, verbose=True)
+        results = run_backtest(masks, bits, config, bet_multis, args.difficulty, verbose=True)
         print_results(results)
         
         # Save results
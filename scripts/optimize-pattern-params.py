@@ -46,14 +46,24 @@ OUTPUT:
   Example: optimization-results-p345-medium-001.json
 """
 
+import io
 import json
+import os
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
-from collections import defaultdict
 from itertools import combinations
 import time
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 def load_bet_multis():
     """Load bet multiplier config for profitability calculations"""
     multis_file = Path(__file__).parent.parent / 'config' / 'bet-multis.json'
@@ -76,127 +86,310 @@ def get_combinations(arr, k):
     """Generate all combinations of size k from array"""
     return list(combinations(arr, k))
 
-def find_common_patterns(history, pattern_size, top_n, discovery_window, use_recency=False, decay_factor=0.98):
+# Combination-index tables keyed by (count, k); every round with the same
+# number of drawn numbers shares one enumeration instead of re-running
+# itertools per round
+_combo_idx_cache = {}
+
+def _combo_index(count, k):
+    """Cached (C(count, k), k) table of k-subset indices into range(count)"""
+    table = _combo_idx_cache.get((count, k))
+    if table is None:
+        table = np.array(get_combinations(range(count), k), dtype=np.int64)
+        _combo_idx_cache[(count, k)] = table
+    return table
+
+def _round_to_mask(round_data):
+    """Bitmask of a round's drawn numbers (bit n-1 = number n)"""
+    mask = 0
+    for n in get_drawn_numbers(round_data):
+        mask |= 1 << (n - 1)
+    return mask
+
+def _pattern_to_mask(pattern):
+    """Bitmask of a pattern's numbers (bit n-1 = number n)"""
+    mask = 0
+    for n in pattern:
+        mask |= 1 << (n - 1)
+    return mask
+
+def _mask_to_numbers(mask):
+    """Sorted number list from a pattern bitmask (bit n-1 = number n)"""
+    return [n for n in range(1, 41) if mask >> (n - 1) & 1]
+
+def build_membership(masks):
+    """(rows, 40) 0/1 matrix unpacked from an iterable of bitmasks.
+
+    Row i column n-1 marks number n, so hit counts between every pattern
+    and every round collapse to one integer matrix product. Mask array
+    views pass through without a copy.
+    """
+    arr = np.ascontiguousarray(masks, dtype=np.int64)
+    return np.unpackbits(
+        arr.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little'
+    )[:, :40]
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False, nogil=True)
+    def _last_hits_kernel(pattern_masks, tracking_masks):
+        """Last full-hit index in the tracking window for every pattern (-1 if none)"""
+        out = np.full(len(pattern_masks), -1, dtype=np.int64)
+        for p in range(len(pattern_masks)):
+            pattern_mask = pattern_masks[p]
+            for i in range(len(tracking_masks) - 1, -1, -1):
+                if tracking_masks[i] & pattern_mask == pattern_mask:
+                    out[p] = i
+                    break
+        return out
+
+    @njit(cache=True, boundscheck=False, nogil=True)
+    def _evaluate_kernel(pattern_masks, future_masks, pattern_size, lookahead_rounds,
+                         multi_row, track):
+        """
+        Compiled core of evaluate_predictions: completion and partial-hit scans
+        over the lookahead window for every pattern, accumulated in the same
+        order as the Python loop so the averages match exactly.
+        Returns (successes, maintaining, rounds_sum, rounds_cnt, profit_sum, profit_cnt)
+        """
+        successes = 0
+        maintaining = 0
+        rounds_sum = 0
+        rounds_cnt = 0
+        profit_sum = 0.0
+        profit_cnt = 0
+
+        for p in range(len(pattern_masks)):
+            pattern_mask = pattern_masks[p]
+            pattern_completed = False
+
+            for j in range(len(future_masks)):
+                if future_masks[j] & pattern_mask == pattern_mask:
+                    rounds_ahead = j + 1
+                    successes += 1
+                    rounds_sum += rounds_ahead
+                    rounds_cnt += 1
+                    pattern_completed = True
+
+                    if track:
+                        profit = multi_row[pattern_size] - rounds_ahead
+                        profit_sum += profit
+                        profit_cnt += 1
+                        if profit >= 0:
+                            maintaining += 1
+                    break
+
+            if not pattern_completed and track:
+                best_profit = float(-lookahead_rounds)
+                for j in range(len(future_masks)):
+                    x = future_masks[j] & pattern_mask
+                    # SWAR popcount: numba has no int.bit_count
+                    x = x - ((x >> 1) & 0x5555555555555555)
+                    x = (x & 0x3333333333333333) + ((x >> 2) & 0x3333333333333333)
+                    x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0F
+                    hits = (x * 0x0101010101010101) >> 56
+
+                    if hits > 0:
+                        multiplier = multi_row[hits]
+                        if multiplier > 0:
+                            profit = multiplier - (j + 1)
+                            if profit > best_profit:
+                                best_profit = profit
+                            if profit >= 0:
+                                break
+
+                profit_sum += best_profit
+                profit_cnt += 1
+                if best_profit >= 0:
+                    maintaining += 1
+
+        return successes, maintaining, rounds_sum, rounds_cnt, profit_sum, profit_cnt
+
+def build_multiplier_table(bet_multis, difficulty):
+    """
+    Flatten the nested bet multiplier config into a dense lookup table:
+    table[pattern_size, hits] is the multiplier for that many hits at this
+    difficulty, so the chained dict lookups with str() keys stay out of the
+    hot loops. Returns None when profitability is not being tracked.
+    """
+    if not bet_multis:
+        return None
+
+    diff_multis = bet_multis.get(difficulty, {})
+    table = np.zeros((11, 11), np.float64)
+    for pattern_size in range(3, 11):
+        size_multis = diff_multis.get(str(pattern_size), {})
+        for hits in range(pattern_size + 1):
+            table[pattern_size, hits] = size_multis.get(str(hits), 0)
+    return table
+
+def find_common_patterns(drawn_nums, pattern_size, top_n, discovery_window, use_recency=False, decay_factor=0.98):
     """
     Find most common patterns in discovery window
-    Returns list of pattern objects with numbers and frequency/score
-    
+    Returns list of pattern objects with bitmask and frequency/score
+    (decode masks with _mask_to_numbers where readable numbers are needed)
+
     If use_recency=True, applies exponential decay weighting where recent appearances
     are weighted higher than older ones (tests if recent patterns predict near-future)
     """
-    pattern_scores = defaultdict(float)
-    
     # Use specified discovery window
-    sample = history[-discovery_window:]
+    sample = drawn_nums[-discovery_window:]
     total_rounds = len(sample)
-    
-    for idx, round_data in enumerate(sample):
-        drawn = get_drawn_numbers(round_data)
-        combos = get_combinations(drawn, pattern_size)
-        
-        # Calculate weight based on recency (most recent = weight 1.0)
-        if use_recency:
-            # Exponential decay: recent rounds get higher weight
-            rounds_ago = total_rounds - idx - 1
-            weight = decay_factor ** rounds_ago
-        else:
-            weight = 1.0
-        
-        for combo in combos:
-            key = tuple(sorted(combo))
-            pattern_scores[key] += weight
-    
-    # Sort by score and return top N
-    sorted_patterns = sorted(pattern_scores.items(), key=lambda x: x[1], reverse=True)
-    return [{'numbers': list(nums), 'count': score} for nums, score in sorted_patterns[:top_n]]
-
-def check_pattern_buildup(pattern, sample_cache, min_hits, max_hits, pattern_size):
-    """Check if pattern shows buildups (partial hits) in sample"""
-    buildups = []
-    
-    for drawn_set in sample_cache:
-        matches = sum(1 for num in pattern if num in drawn_set)
-        if min_hits <= matches <= max_hits:
-            buildups.append(matches)
-    
-    return buildups
-
-def check_last_full_hit(pattern, tracking_cache, pattern_size):
-    """Find when pattern last hit fully in tracking window"""
-    for i in range(len(tracking_cache) - 1, -1, -1):
-        matches = sum(1 for num in pattern if num in tracking_cache[i])
-        if matches == pattern_size:
-            return i
-    return -1
-
-def evaluate_predictions(history, current_idx, patterns, lookahead_rounds, pattern_size, bet_multis=None, difficulty='high'):
+
+    # Per-round weights in one vectorized pass (most recent = weight 1.0):
+    # exponential decay when recency is on, uniform otherwise
+    if use_recency:
+        round_weights = decay_factor ** np.arange(total_rounds - 1, -1, -1, dtype=np.float64)
+    else:
+        round_weights = np.ones(total_rounds)
+
+    # One combo-mask array per round: each k-subset of the drawn numbers
+    # collapses to a bitmask, so scoring becomes array arithmetic instead
+    # of millions of tuple allocations and dict hashes
+    mask_chunks = []
+    weight_chunks = []
+    for idx, drawn in enumerate(sample):
+        if len(drawn) < pattern_size:
+            continue
+        combo_masks = (np.int64(1) << (drawn[_combo_index(len(drawn), pattern_size)] - 1)).sum(axis=1)
+        mask_chunks.append(combo_masks)
+        weight_chunks.append(np.full(len(combo_masks), round_weights[idx]))
+
+    if not mask_chunks:
+        return []
+
+    all_masks = np.concatenate(mask_chunks)
+    all_weights = np.concatenate(weight_chunks)
+
+    # Accumulate per-pattern scores; add.at applies in scan order, matching
+    # the accumulation order of the old per-round dict updates
+    uniq_masks, first_seen, inverse = np.unique(all_masks, return_index=True, return_inverse=True)
+    scores = np.zeros(len(uniq_masks))
+    np.add.at(scores, inverse, all_weights)
+
+    # Preselect the top-N band with O(M) argpartition instead of sorting all
+    # scores; ties at the boundary score keep their first-appearance order,
+    # exactly as the full sort resolved them
+    if len(scores) > top_n:
+        kth = scores[np.argpartition(-scores, top_n - 1)[:top_n]].min()
+        keep = np.flatnonzero(scores > kth)
+        edge = np.flatnonzero(scores == kth)
+        edge = edge[np.argsort(first_seen[edge], kind='stable')[:top_n - len(keep)]]
+        sel = np.concatenate((keep, edge))
+    else:
+        sel = np.arange(len(scores))
+
+    # Sort by score descending with first appearance breaking ties, the
+    # same order a stable sort over dict insertion order produced
+    order = sel[np.lexsort((first_seen[sel], -scores[sel]))]
+    return [{'mask': int(uniq_masks[i]), 'count': float(scores[i])} for i in order]
+
+def evaluate_predictions(drawn_masks, current_idx, pattern_masks, lookahead_rounds, pattern_size, multi_table=None):
     """
-    Check if predicted patterns completed in the next lookahead_rounds
+    Check if predicted patterns (given as a mask array) completed in the
+    next lookahead_rounds
     Returns: (predictions_made, successful_predictions, avg_rounds_to_hit, maintaining_count, avg_profit)
     """
-    if current_idx + lookahead_rounds > len(history):
+    if current_idx + lookahead_rounds > len(drawn_masks):
         return 0, 0, 0, 0, 0  # Not enough future data
-    
-    future_rounds = history[current_idx:current_idx + lookahead_rounds]
-    
-    successes = 0
-    maintaining = 0  # Patterns that didn't lose money (profit >= 0)
-    rounds_to_hit = []
-    profits = []  # Track profit/loss for each pattern
-    
-    for pattern_obj in patterns:
-        pattern = set(pattern_obj['numbers'])
-        pattern_completed = False
-        
-        # Check if pattern completes in future rounds
-        for rounds_ahead, round_data in enumerate(future_rounds, 1):
-            drawn = set(get_drawn_numbers(round_data))
-            hits = len(pattern.intersection(drawn))
-            
-            # Check for full completion
-            if pattern.issubset(drawn):  # All pattern numbers drawn
-                successes += 1
-                rounds_to_hit.append(rounds_ahead)
-                pattern_completed = True
-                
-                # Calculate profit if bet_multis provided
-                if bet_multis:
-                    multiplier = bet_multis.get(difficulty, {}).get(str(pattern_size), {}).get(str(pattern_size), 0)
-                    profit = (multiplier - rounds_ahead)  # Win - cost of rounds
-                    profits.append(profit)
-                    if profit >= 0:
-                        maintaining += 1
-                break
-        
-        # If didn't complete fully, check if it "maintained" (partial hit with positive return)
-        if not pattern_completed and bet_multis:
-            # Find best partial hit in lookahead window
-            best_profit = -lookahead_rounds  # Worst case: lose all rounds
-            for rounds_ahead, round_data in enumerate(future_rounds, 1):
-                drawn = set(get_drawn_numbers(round_data))
-                hits = len(pattern.intersection(drawn))
-                
-                if hits > 0:
-                    # Get multiplier for partial hit
-                    multiplier = bet_multis.get(difficulty, {}).get(str(pattern_size), {}).get(str(hits), 0)
-                    if multiplier > 0:
-                        profit = multiplier - rounds_ahead
-                        best_profit = max(best_profit, profit)
-                        if profit >= 0:
-                            # Found a maintaining hit
-                            break
-            
-            profits.append(best_profit)
-            if best_profit >= 0:
-                maintaining += 1
-    
-    avg_rounds = sum(rounds_to_hit) / len(rounds_to_hit) if rounds_to_hit else 0
-    avg_profit = sum(profits) / len(profits) if profits else 0
-    maintaining_rate = (maintaining / len(patterns) * 100) if patterns else 0
-    
-    return len(patterns), successes, avg_rounds, maintaining, avg_profit
 
-def run_backtest(history, params, test_num=None, total_tests=None, pattern_size=5, bet_multis=None, difficulty='high', use_recency=False, decay_factor=0.98):
+    # One mask per future round, shared by every pattern below
+    future_masks = drawn_masks[current_idx:current_idx + lookahead_rounds]
+    track = multi_table is not None
+
+    # Compiled fast path: both scans run inside a numba kernel over int64
+    # mask arrays (masks fit in 40 bits, so the int64 view is lossless)
+    if njit is not None:
+        pattern_arr = np.ascontiguousarray(pattern_masks)
+        future_arr = np.ascontiguousarray(future_masks)
+        multi_row = multi_table[pattern_size] if track else np.zeros(11, np.float64)
+        successes, maintaining, rounds_sum, rounds_cnt, profit_sum, profit_cnt = _evaluate_kernel(
+            pattern_arr, future_arr, pattern_size, lookahead_rounds,
+            multi_row, track
+        )
+        avg_rounds = rounds_sum / rounds_cnt if rounds_cnt else 0
+        avg_profit = profit_sum / profit_cnt if profit_cnt else 0
+        return len(pattern_masks), successes, avg_rounds, maintaining, avg_profit
+
+    # Vectorized fallback: one broadcast (patterns, lookahead) hit-count
+    # matrix replaces the per-pattern future scans
+    hit_counts = np.bitwise_count(future_masks[None, :] & pattern_masks[:, None]).astype(np.int64)
+
+    # Full completion: subset test is hit count == pattern size; argmax
+    # finds the first completing round per pattern
+    full_hits = hit_counts == pattern_size
+    completed = full_hits.any(axis=1)
+    first_hit = full_hits.argmax(axis=1)
+    successes = int(completed.sum())
+    avg_rounds = (first_hit[completed] + 1).sum() / successes if successes else 0
+
+    maintaining = 0
+    avg_profit = 0
+    if track:
+        rounds_ahead = np.arange(1, len(future_masks) + 1)
+        # Per-round partial profits; rounds with no payable hit drop to -inf
+        mults = multi_table[pattern_size][hit_counts]
+        round_profits = np.where((hit_counts > 0) & (mults > 0),
+                                 mults - rounds_ahead, -np.inf)
+
+        # The scalar loop kept a running best and stopped at the first
+        # non-negative profit; a cumulative max cut at that round matches it
+        running_max = np.maximum.accumulate(round_profits, axis=1)
+        nonneg = round_profits >= 0
+        has_nonneg = nonneg.any(axis=1)
+        stop = np.where(has_nonneg, nonneg.argmax(axis=1), len(future_masks) - 1)
+        best_profit = np.maximum(running_max[np.arange(len(pattern_masks)), stop],
+                                 -lookahead_rounds)
+
+        # Completed patterns pay the full-hit multiplier minus rounds waited
+        profits = np.where(completed,
+                           multi_table[pattern_size, pattern_size] - (first_hit + 1),
+                           best_profit)
+        maintaining = int((profits >= 0).sum())
+        # Left-to-right sum matches the old per-pattern float accumulation
+        avg_profit = sum(profits.tolist()) / len(pattern_masks)
+
+    return len(pattern_masks), successes, avg_rounds, maintaining, avg_profit
+
+# Memo for discovery results keyed by window bounds and scoring settings,
+# reset whenever a different dataset comes through; repeated sweeps over the
+# same history revisit identical windows even without the precomputed table
+_discovery_memo = {}
+_discovery_memo_src = None
+
+def _discover_cached(drawn_nums, current_idx, pattern_size, discovery_window, use_recency, decay_factor):
+    """Discovery for one evaluation point, memoized on the window identity"""
+    global _discovery_memo_src
+    src = (id(drawn_nums), len(drawn_nums))
+    if _discovery_memo_src != src:
+        _discovery_memo.clear()
+        _discovery_memo_src = src
+
+    key = (max(0, current_idx - discovery_window), current_idx, pattern_size, use_recency, decay_factor)
+    cached = _discovery_memo.get(key)
+    if cached is None:
+        discovery_history = drawn_nums[max(0, current_idx - discovery_window):current_idx]
+        all_patterns = find_common_patterns(discovery_history, pattern_size, 100, discovery_window, use_recency, decay_factor)
+        pattern_arr = np.array([p['mask'] for p in all_patterns], dtype=np.int64)
+        pattern_mat = build_membership(pattern_arr).astype(np.int32)
+        cached = (all_patterns, pattern_arr, pattern_mat)
+        _discovery_memo[key] = cached
+    return cached
+
+def discover_patterns_by_idx(drawn_nums, drawn_masks, pattern_size, use_recency=False, decay_factor=0.98,
+                             discovery_window=500, lookahead=30, step_size=50, min_start=700):
+    """
+    Pattern discovery depends only on the evaluation point, never on the
+    grid parameters, so compute each point's candidate list exactly once
+    and share it across every run_backtest call. Each entry carries the
+    decoded patterns plus their mask array and membership matrix.
+    """
+    patterns_by_idx = {}
+    for current_idx in range(min_start, len(drawn_masks) - lookahead, step_size):
+        patterns_by_idx[current_idx] = _discover_cached(
+            drawn_nums, current_idx, pattern_size, discovery_window, use_recency, decay_factor)
+    return patterns_by_idx
+
+def run_backtest(drawn_nums, drawn_masks, params, pattern_size=5, bet_multis=None, difficulty='high', use_recency=False, decay_factor=0.98, patterns_by_idx=None):
     """
     Backtest a specific parameter combination
     
@@ -214,7 +407,10 @@ def run_backtest(history, params, test_num=None, total_tests=None, pattern_size=
     
     discovery_window = 500
     lookahead = 30
-    
+
+    # Dense multiplier lookup shared by every evaluation (None = not tracking)
+    multi_table = build_multiplier_table(bet_multis, difficulty)
+
     total_predictions = 0
     total_successes = 0
     total_maintaining = 0
@@ -228,60 +424,62 @@ def run_backtest(history, params, test_num=None, total_tests=None, pattern_size=
     # Evaluate every 50 rounds to balance speed vs accuracy
     step_size = 50
     
-    total_iterations = len(range(start_idx, len(history) - lookahead, step_size))
-    
-    for iteration, current_idx in enumerate(range(start_idx, len(history) - lookahead, step_size), 1):
-        # Log progress every 20 iterations
-        if test_num and iteration % 20 == 0:
-            iter_progress = (iteration / total_iterations) * 100
-            print(f"  [{test_num}/{total_tests}] Iteration {iteration}/{total_iterations} ({iter_progress:.1f}%)")
-        # Get patterns from discovery window
-        discovery_history = history[max(0, current_idx - discovery_window):current_idx]
-        all_patterns = find_common_patterns(discovery_history, pattern_size, 100, discovery_window, use_recency, decay_factor)
-        
+    for current_idx in range(start_idx, len(drawn_masks) - lookahead, step_size):
+        # Get patterns from discovery window (shared across the grid sweep
+        # when precomputed — they do not depend on the parameters)
+        cached = patterns_by_idx.get(current_idx) if patterns_by_idx else None
+        if cached is None:
+            cached = _discover_cached(drawn_nums, current_idx, pattern_size,
+                                      discovery_window, use_recency, decay_factor)
+        all_patterns, pattern_arr, pattern_mat = cached
+
         if not all_patterns:
             continue
-        
-        # Build caches for this point in time
-        sample = history[current_idx - sample_size:current_idx]
-        tracking = history[max(0, current_idx - 1000):current_idx]  # Reduced from 2000 for speed
-        
-        sample_cache = [set(get_drawn_numbers(r)) for r in sample]
-        tracking_cache = [set(get_drawn_numbers(r)) for r in tracking]
-        
-        # Filter patterns based on params
-        filtered_patterns = []
-        
-        for pattern_obj in all_patterns:
-            pattern = pattern_obj['numbers']
-            
-            # Check buildups in sample
-            buildups = check_pattern_buildup(pattern, sample_cache, min_hits, max_hits, pattern_size)
-            if not buildups:
-                continue
-            
-            # Calculate hit rate in sample
-            hit_count = len(buildups)
-            hit_rate = (hit_count / len(sample)) * 100
-            if hit_rate < 10:  # Min 10% hit rate filter
-                continue
-            
-            # Check last full hit
-            last_full_hit_idx = check_last_full_hit(pattern, tracking_cache, pattern_size)
-            
-            if not_hit_in > 0:
-                tracking_size = len(tracking_cache)
-                if last_full_hit_idx != -1:
-                    bets_ago = (tracking_size - 1) - last_full_hit_idx
-                    if bets_ago < not_hit_in:
-                        continue  # Pattern hit too recently
-            
-            filtered_patterns.append(pattern_obj)
+
+        # Slices of the precomputed mask array for this point in time
+        sample_masks = drawn_masks[current_idx - sample_size:current_idx]
+        tracking_masks = drawn_masks[max(0, current_idx - 1000):current_idx]  # Reduced from 2000 for speed
+
+        # Buildup counts for every candidate at once: one (patterns, rounds)
+        # hit-count matrix product replaces the per-pattern sample scans
+        sample_mat = build_membership(sample_masks).astype(np.int32)
+        hits = pattern_mat @ sample_mat.T
+        buildup_counts = ((hits >= min_hits) & (hits <= max_hits)).sum(axis=1)
+        hit_rates = buildup_counts / len(sample_masks) * 100
+
+        # Filter cheapest-first: buildups in sample and a minimum 10% hit
+        # rate, straight off the vectorized counts
+        survivors = np.flatnonzero((buildup_counts > 0) & (hit_rates >= 10))
+
+        # Check last full hit — only for survivors, and only when the
+        # recency exclusion is active
+        if not_hit_in > 0 and len(survivors):
+            surv_arr = pattern_arr[survivors]
+            if njit is not None:
+                last_hits = _last_hits_kernel(surv_arr, np.ascontiguousarray(tracking_masks))
+            else:
+                # Reverse argmax over the full-hit matrix finds each
+                # survivor's most recent completion in one shot
+                track_mat = build_membership(tracking_masks).astype(np.int32)
+                surv_mat = build_membership(surv_arr).astype(np.int32)
+                full = (surv_mat @ track_mat.T) == pattern_size
+                found = full.any(axis=1)
+                last_hits = np.where(
+                    found, len(tracking_masks) - 1 - full[:, ::-1].argmax(axis=1), -1)
+
+            tracking_size = len(tracking_masks)
+            bets_ago = (tracking_size - 1) - np.asarray(last_hits)
+            recent = (np.asarray(last_hits) != -1) & (bets_ago < not_hit_in)
+            survivors = survivors[~recent]  # Pattern hit too recently
+
+        # Surviving masks go straight to evaluation as an array view; no
+        # per-point pattern-object lists get rebuilt
+        filtered_masks = pattern_arr[survivors]
         
         # Evaluate predictions
-        if filtered_patterns:
+        if len(filtered_masks):
             preds, successes, avg_rounds, maintaining, avg_profit = evaluate_predictions(
-                history, current_idx, filtered_patterns, lookahead, pattern_size, bet_multis, difficulty
+                drawn_masks, current_idx, filtered_masks, lookahead, pattern_size, multi_table
             )
             total_predictions += preds
             total_successes += successes
@@ -312,7 +510,42 @@ def run_backtest(history, params, test_num=None, total_tests=None, pattern_size=
         'avg_profit': avg_profit
     }
 
-def optimize_parameters(history, pattern_size, bet_multis=None, difficulty='high', use_recency=False, decay_factor=0.98):
+# Shared state for optimization workers, populated once per process via the
+# pool initializer so the dataset arrays are not re-pickled for every test
+_OPT_DRAWN_NUMS = None
+_OPT_DRAWN_MASKS = None
+_OPT_BET_MULTIS = None
+_OPT_DIFFICULTY = 'high'
+_OPT_PATTERN_SIZE = 5
+_OPT_USE_RECENCY = False
+_OPT_DECAY = 0.98
+_OPT_PATTERNS_BY_IDX = None
+
+def _init_optimize_worker(drawn_nums, drawn_masks, bet_multis, difficulty,
+                          pattern_size, use_recency, decay_factor,
+                          patterns_by_idx):
+    global _OPT_DRAWN_NUMS, _OPT_DRAWN_MASKS, _OPT_BET_MULTIS, _OPT_DIFFICULTY
+    global _OPT_PATTERN_SIZE, _OPT_USE_RECENCY, _OPT_DECAY, _OPT_PATTERNS_BY_IDX
+    _OPT_DRAWN_NUMS = drawn_nums
+    _OPT_DRAWN_MASKS = drawn_masks
+    _OPT_BET_MULTIS = bet_multis
+    _OPT_DIFFICULTY = difficulty
+    _OPT_PATTERN_SIZE = pattern_size
+    _OPT_USE_RECENCY = use_recency
+    _OPT_DECAY = decay_factor
+    _OPT_PATTERNS_BY_IDX = patterns_by_idx
+
+def _run_params(params):
+    """Run one parameter combination in a worker, capturing any printed output"""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        result = run_backtest(_OPT_DRAWN_NUMS, _OPT_DRAWN_MASKS, params,
+                              _OPT_PATTERN_SIZE, _OPT_BET_MULTIS,
+                              _OPT_DIFFICULTY, _OPT_USE_RECENCY, _OPT_DECAY,
+                              _OPT_PATTERNS_BY_IDX)
+    return result, buf.getvalue()
+
+def optimize_parameters(drawn_nums, drawn_masks, pattern_size, bet_multis=None, difficulty='high', use_recency=False, decay_factor=0.98):
     """
     Test various parameter combinations and find optimal settings
     """
@@ -370,47 +603,63 @@ def optimize_parameters(history, pattern_size, bet_multis=None, difficulty='high
     print(f"Testing {total_tests} parameter combinations...")
     print("This may take a few minutes...\n")
     
-    test_num = 0
-    start_time = time.time()
-    
+    # Build the full task list up front; the combinations are independent,
+    # so they fan out across processes below
+    tasks = []
     for sample_size in param_grid['sample_size']:
         for min_hits in param_grid['min_hits']:
             for max_hits in param_grid['max_hits']:
                 if min_hits > max_hits:
                     continue
-                
+
                 for not_hit_in in param_grid['not_hit_in']:
-                    test_num += 1
-                    
-                    params = {
+                    tasks.append({
                         'sample_size': sample_size,
                         'min_hits': min_hits,
                         'max_hits': max_hits,
                         'not_hit_in': not_hit_in
-                    }
-                    
-                    elapsed = time.time() - start_time
-                    progress = (test_num / total_tests) * 100
-                    remaining = (elapsed / test_num) * (total_tests - test_num)
-                    print(f"\n[TEST {test_num}/{total_tests}] ({progress:.1f}%) - Elapsed: {elapsed:.0f}s, Est. Remaining: {remaining:.0f}s")
-                    print(f"  Parameters: sample={sample_size}, hits={min_hits}-{max_hits}, notHitIn={not_hit_in}")
-                    
-                    result = run_backtest(history, params, test_num, total_tests, pattern_size, bet_multis, difficulty, use_recency, decay_factor)
-                    result['pattern_size'] = pattern_size
-                    results.append(result)
-                    
-                    # Show result immediately
-                    if result['total_predictions'] > 0:
-                        maintaining_info = f", {result['maintaining_rate']:.1f}% maintaining" if bet_multis else ""
-                        profit_info = f", avg profit: {result['avg_profit']:.2f}x" if bet_multis else ""
-                        print(f"  ✓ Result: {result['success_rate']:.2f}% success{maintaining_info}{profit_info}, {result['avg_rounds_to_hit']:.1f} avg rounds, {result['total_predictions']} predictions")
-                    else:
-                        print(f"  ✗ No predictions with these parameters")
-                    if result['total_predictions'] > 0:
-                        print(f"  ✓ Result: {result['success_rate']:.2f}% success, {result['avg_rounds_to_hit']:.1f} avg rounds, {result['total_predictions']} predictions")
-                    else:
-                        print(f"  ✗ No predictions with these parameters")
-    
+                    })
+
+    # Discover candidate patterns per evaluation point once, shared by all
+    # tests; every grid combination starts from the same first point
+    patterns_by_idx = discover_patterns_by_idx(
+        drawn_nums, drawn_masks, pattern_size, use_recency, decay_factor,
+        min_start=max(500, max(param_grid['sample_size'])) + 200)
+
+    start_time = time.time()
+
+    # map() yields in submission order and each worker returns its captured
+    # prints, so the output reads exactly like the sequential version
+    n_workers = min(os.cpu_count() or 1, len(tasks))
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             initializer=_init_optimize_worker,
+                             initargs=(drawn_nums, drawn_masks, bet_multis, difficulty,
+                                       pattern_size, use_recency, decay_factor,
+                                       patterns_by_idx)) as pool:
+        for test_num, (params, (result, captured)) in enumerate(zip(tasks, pool.map(_run_params, tasks)), 1):
+            sample_size = params['sample_size']
+            min_hits = params['min_hits']
+            max_hits = params['max_hits']
+            not_hit_in = params['not_hit_in']
+
+            elapsed = time.time() - start_time
+            progress = (test_num / total_tests) * 100
+            remaining = (elapsed / test_num) * (total_tests - test_num)
+            print(f"\n[TEST {test_num}/{total_tests}] ({progress:.1f}%) - Elapsed: {elapsed:.0f}s, Est. Remaining: {remaining:.0f}s")
+            print(f"  Parameters: sample={sample_size}, hits={min_hits}-{max_hits}, notHitIn={not_hit_in}")
+            sys.stdout.write(captured)
+
+            result['pattern_size'] = pattern_size
+            results.append(result)
+
+            # Show result immediately
+            if result['total_predictions'] > 0:
+                maintaining_info = f", {result['maintaining_rate']:.1f}% maintaining" if bet_multis else ""
+                profit_info = f", avg profit: {result['avg_profit']:.2f}x" if bet_multis else ""
+                print(f"  ✓ Result: {result['success_rate']:.2f}% success{maintaining_info}{profit_info}, {result['avg_rounds_to_hit']:.1f} avg rounds, {result['total_predictions']} predictions")
+            else:
+                print(f"  ✗ No predictions with these parameters")
+
     elapsed = time.time() - start_time
     print(f"\nCompleted {total_tests} tests in {elapsed:.1f}s")
     print(f"Average: {elapsed/total_tests:.2f}s per test\n")
@@ -547,7 +796,13 @@ def main():
         print(f"Limited dataset to last {args.limit} rounds (from {original_length} total)")
     
     print(f"Using {len(history)} rounds of history for optimization")
-    
+
+    # Parse each round exactly once for the whole run: every helper works
+    # on slices of these instead of re-reading the raw history dicts
+    drawn_nums = [np.asarray(get_drawn_numbers(r), dtype=np.int64) for r in history]
+    drawn_masks = np.array([_round_to_mask(r) for r in history], dtype=np.int64)
+
+
     # Load bet multipliers if tracking maintaining
     bet_multis = None
     if args.track_maintaining:
@@ -568,7 +823,7 @@ def main():
             print(f"Warning: Skipping pattern_size={pattern_size} (must be 3-10)")
             continue
             
-        results = optimize_parameters(history, pattern_size, bet_multis, args.difficulty, args.recency_weight, args.decay)
+        results = optimize_parameters(drawn_nums, drawn_masks, pattern_size, bet_multis, args.difficulty, args.recency_weight, args.decay)
         all_results[pattern_size] = results
     
     # Print and save results for each pattern size
@@ -3,21 +3,104 @@ Quick test script for momentum generator
 Verifies basic functionality without full backtest
 """
 
+import heapq
 import json
+import random
 import sys
 from pathlib import Path
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Above this file size, prefer streaming over a whole-file parse
+STREAM_THRESHOLD = 64 * 1024 * 1024
+
+if njit is not None:
+    @njit(cache=True)
+    def _window_counts_kernel(mat, detection_window, baseline_window):
+        """Recent/baseline draw counts per number from the membership matrix"""
+        rounds = mat.shape[0]
+        recent = np.zeros(40, dtype=np.int64)
+        baseline = np.zeros(40, dtype=np.int64)
+        for n in range(40):
+            for i in range(rounds - detection_window, rounds):
+                recent[n] += mat[i, n]
+            for i in range(rounds - baseline_window, rounds):
+                baseline[n] += mat[i, n]
+        return recent, baseline
+
+def momentum_from_counts(recent_count, baseline_count, detection_window, baseline_window):
+    """Momentum per number given window draw counts"""
+    recent_freq = recent_count / detection_window
+    baseline_freq = baseline_count / baseline_window
+    momentum = np.where(recent_count > 0, 999.0, 0.0)
+    covered = baseline_count > 0
+    momentum[covered] = recent_freq[covered] / baseline_freq[covered]
+    return momentum
+
 def load_history(filepath):
     """Load Keno game history from JSON file"""
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    with open(filepath, 'rb') as f:
+        data = f.read()
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_history_streaming(filepath, limit=None):
+    """Load history one round at a time instead of parsing the whole file.
+
+    Streams rounds with ijson once a file crosses STREAM_THRESHOLD, so
+    only the rounds kept are ever in memory; smaller files (or missing
+    ijson) take the whole-file parse, which is faster for them. limit
+    caps the number of rounds read from the front of the file.
+    """
+    if ijson is None or Path(filepath).stat().st_size < STREAM_THRESHOLD:
+        history = load_history(filepath)
+        return history if limit is None else history[:limit]
+
+    history = []
+    with open(filepath, 'rb') as f:
+        for round_data in ijson.items(f, 'item'):
+            history.append(round_data)
+            if limit is not None and len(history) >= limit:
+                break
+    return history
 
 def get_drawn_numbers(round_data):
     """Extract drawn numbers from round data"""
+    cached = round_data.get('_drawn')
+    if cached is not None:
+        return cached
     if 'drawn' in round_data:
         return round_data['drawn']
     return sorted(round_data.get('hits', []) + round_data.get('misses', []))
 
+def attach_round_caches(history):
+    """Parse each round's drawn numbers once and stash them on the round.
+
+    Round dicts are shared between history slices, so downstream code
+    never has to rebuild the hits+misses fallback per call.
+    """
+    for round_data in history:
+        if '_drawn' not in round_data:
+            round_data['_drawn'] = get_drawn_numbers(round_data)
+    return history
+
 class MomentumPatternGenerator:
     """Momentum-based pattern generator"""
     
@@ -30,34 +113,158 @@ class MomentumPatternGenerator:
             'refresh_frequency': 5,
             'top_n_pool': 15
         }
+        # Bind settings once so hot paths skip the dict lookups
+        self.pattern_size = self.config['pattern_size']
+        self.detection_window = self.config['detection_window']
+        self.baseline_window = self.config['baseline_window']
+        self.momentum_threshold = self.config['momentum_threshold']
+        self.refresh_frequency = self.config['refresh_frequency']
+        self.top_n_pool = self.config['top_n_pool']
         self.current_pattern = []
         self.last_refresh_round = 0
-    
+        self._next_refresh_round = 0
+        self._matrix_cache = {}
+        self._mask_cache = {}
+        self._drawn_sets_cache = {}
+        self._counts_cache = {}
+        self._momentum_cache = {}
+
+    def _drawn_sets(self, history, start=0):
+        """Frozenset of drawn numbers per round from start on, cached per history"""
+        key = (id(history), len(history), start)
+        sets = self._drawn_sets_cache.get(key)
+        if sets is None:
+            sets = [frozenset(get_drawn_numbers(history[i]))
+                    for i in range(start, len(history))]
+            self._drawn_sets_cache[key] = sets
+        return sets
+
+    def _round_masks(self, history, start=0):
+        """int64 bitmask per round (bit n-1 = number n), cached per history"""
+        key = (id(history), len(history), start)
+        masks = self._mask_cache.get(key)
+        if masks is None:
+            masks = np.fromiter(
+                (sum(1 << (num - 1) for num in drawn)
+                 for drawn in self._drawn_sets(history, start)),
+                dtype=np.int64, count=len(history) - start
+            )
+            self._mask_cache[key] = masks
+        return masks
+
+    def _window_matrix(self, history):
+        """0/1 membership rows for the last baseline_window rounds.
+
+        Slid in place when the same history object has grown: existing
+        rows shift up and only the new rounds are parsed, so walk-forward
+        callers pay per new round instead of per history length. Any
+        other history rebuilds from the round bitmasks.
+        """
+        baseline_window = self.baseline_window
+        key = id(history)
+        cached = self._matrix_cache.get(key)
+        total = len(history)
+
+        if cached is not None and cached[0] is history:
+            _, prev_len, mat = cached
+            if prev_len == total:
+                return mat
+            delta = total - prev_len
+            if 0 < delta < baseline_window <= prev_len:
+                mat[:-delta] = mat[delta:]
+                for i, t in enumerate(range(total - delta, total)):
+                    row = mat[baseline_window - delta + i]
+                    row[:] = 0
+                    row[np.asarray(get_drawn_numbers(history[t])) - 1] = 1
+                self._matrix_cache[key] = (history, total, mat)
+                return mat
+
+        # Expand the round bitmasks: one byte row per mask, low bit first
+        rows = min(total, baseline_window)
+        masks = self._round_masks(history, total - rows)
+        mat = np.unpackbits(
+            masks.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little'
+        )[:, :40].copy()
+        self._matrix_cache[key] = (history, total, mat)
+        return mat
+
+    def _window_counts(self, history):
+        """Recent/baseline count vectors, slid incrementally as history grows"""
+        detection_window = self.detection_window
+        baseline_window = self.baseline_window
+        key = id(history)
+        cached = self._counts_cache.get(key)
+        total = len(history)
+
+        if cached is not None and cached[0] is history:
+            _, prev_len, recent, baseline = cached
+            if prev_len == total:
+                return recent, baseline
+            if baseline_window <= prev_len < total:
+                # Slide both windows forward one round at a time: each new
+                # round enters, the round falling off each window leaves
+                for t in range(prev_len, total):
+                    entering = np.asarray(get_drawn_numbers(history[t])) - 1
+                    recent[entering] += 1
+                    baseline[entering] += 1
+                    leaving = np.asarray(get_drawn_numbers(history[t - detection_window])) - 1
+                    recent[leaving] -= 1
+                    leaving = np.asarray(get_drawn_numbers(history[t - baseline_window])) - 1
+                    baseline[leaving] -= 1
+                self._counts_cache[key] = (history, total, recent, baseline)
+                return recent, baseline
+
+        mat = self._window_matrix(history)
+        if njit is not None:
+            recent, baseline = _window_counts_kernel(mat, detection_window, baseline_window)
+        else:
+            recent = mat[-detection_window:].sum(axis=0).astype(np.int64)
+            baseline = mat[-baseline_window:].sum(axis=0).astype(np.int64)
+        self._counts_cache[key] = (history, total, recent, baseline)
+        return recent, baseline
+
+    def momentum_vector(self, history):
+        """Momentum for all 40 numbers at once (index n-1 = number n)"""
+        if len(history) < self.baseline_window:
+            return None
+
+        key = (id(history), len(history))
+        momentum = self._momentum_cache.get(key)
+        if momentum is None:
+            recent_count, baseline_count = self._window_counts(history)
+            momentum = momentum_from_counts(recent_count, baseline_count,
+                                            self.detection_window,
+                                            self.baseline_window)
+            self._momentum_cache[key] = momentum
+        return momentum
+
     def get_pattern(self, history, current_round_number):
         should_refresh = (
             len(self.current_pattern) == 0 or
-            current_round_number % self.config['refresh_frequency'] == 0
+            current_round_number >= self._next_refresh_round or
+            current_round_number < self.last_refresh_round
         )
-        
+
         if should_refresh:
-            if len(history) < self.config['baseline_window']:
+            if len(history) < self.baseline_window:
                 return self.get_fallback_pattern(history)
-            
+
             self.current_pattern = self.generate_pattern(history)
             self.last_refresh_round = current_round_number
-        
+            self._next_refresh_round = current_round_number + self.refresh_frequency
+
         return self.current_pattern
     
     def generate_pattern(self, history):
-        hot_numbers = self.identify_hot_numbers(history)
-        top_candidates = hot_numbers[:self.config['top_n_pool']]
-        
-        pattern = [item['number'] for item in top_candidates[:self.config['pattern_size']]]
+        hot_numbers, _ = self.identify_hot_numbers(history)
+        top_candidates = hot_numbers[:self.top_n_pool]
+
+        pattern = [int(num) for num in top_candidates[:self.pattern_size]]
         
-        if len(pattern) < self.config['pattern_size']:
+        if len(pattern) < self.pattern_size:
             fallback = self.get_most_frequent_numbers(
                 history,
-                self.config['pattern_size'] - len(pattern),
+                self.pattern_size - len(pattern),
                 pattern
             )
             pattern.extend(fallback)
@@ -65,149 +272,138 @@ class MomentumPatternGenerator:
         return sorted(pattern)
     
     def identify_hot_numbers(self, history):
-        hot_numbers = []
-        
-        for number in range(1, 41):
-            momentum = self.calculate_momentum(number, history)
-            
-            if momentum is not None and momentum >= self.config['momentum_threshold']:
-                hot_numbers.append({'number': number, 'momentum': momentum})
-        
-        return sorted(hot_numbers, key=lambda x: x['momentum'], reverse=True)
-    
+        """Hot numbers and their momentum as parallel arrays, hottest first"""
+        momentum = self.momentum_vector(history)
+        if momentum is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # Stable descending sort keeps ascending-number order among ties,
+        # matching the old per-number loop + stable sort
+        order = np.argsort(-momentum, kind='stable')
+        hot = order[momentum[order] >= self.momentum_threshold]
+        return hot + 1, momentum[hot]
+
     def calculate_momentum(self, number, history):
-        if len(history) < self.config['baseline_window']:
+        momentum = self.momentum_vector(history)
+        if momentum is None:
             return None
-        
-        recent_rounds = history[-self.config['detection_window']:]
-        baseline_rounds = history[-self.config['baseline_window']:]
-        
-        recent_count = sum(1 for round_data in recent_rounds 
-                          if number in get_drawn_numbers(round_data))
-        baseline_count = sum(1 for round_data in baseline_rounds 
-                            if number in get_drawn_numbers(round_data))
-        
-        recent_freq = recent_count / self.config['detection_window']
-        baseline_freq = baseline_count / self.config['baseline_window']
-        
-        if baseline_freq == 0:
-            return 999 if recent_count > 0 else 0
-        
-        return recent_freq / baseline_freq
+        return momentum[number - 1]
     
     def get_most_frequent_numbers(self, history, count, exclude=None):
         if exclude is None:
             exclude = []
         
-        frequencies = {i: 0 for i in range(1, 41)}
-        
-        baseline_rounds = history[-self.config['baseline_window']:]
-        for round_data in baseline_rounds:
-            for num in get_drawn_numbers(round_data):
-                frequencies[num] += 1
-        
-        sorted_nums = sorted(
-            [(num, freq) for num, freq in frequencies.items() if num not in exclude],
-            key=lambda x: x[1],
-            reverse=True
+        frequencies = self._window_matrix(history).sum(axis=0)
+
+        # Candidates are built in ascending-number order, and nlargest is
+        # documented to match sorted(..., reverse=True)[:count], so ties
+        # still resolve in ascending-number order
+        top_nums = heapq.nlargest(
+            count,
+            [(num, int(frequencies[num - 1])) for num in range(1, 41) if num not in exclude],
+            key=lambda x: x[1]
         )
-        
-        return [num for num, freq in sorted_nums[:count]]
+
+        return [num for num, freq in top_nums]
     
     def get_fallback_pattern(self, history):
         if len(history) == 0:
             return self.get_random_pattern()
         
-        return self.get_most_frequent_numbers(history, self.config['pattern_size'], [])
+        return self.get_most_frequent_numbers(history, self.pattern_size, [])
     
     def get_random_pattern(self):
-        import random
-        numbers = list(range(1, 41))
-        random.shuffle(numbers)
-        return sorted(numbers[:self.config['pattern_size']])
+        return sorted(random.sample(range(1, 41), self.pattern_size))
 
 def test_basic_functionality():
     """Test basic momentum generator functions"""
-    print("="*60)
-    print("MOMENTUM GENERATOR - QUICK TEST")
-    print("="*60)
-    
-    # Load data
-    data_file = Path(__file__).parent.parent / 'data' / 'keno-history-1765519065670.json'
-    if not data_file.exists():
-        print(f"Error: Data file not found: {data_file}")
-        return False
-    
-    history = load_history(data_file)
-    print(f"\n✓ Loaded {len(history)} rounds of history")
-    
-    # Create generator
-    config = {
-        'pattern_size': 10,
-        'detection_window': 5,
-        'baseline_window': 50,
-        'momentum_threshold': 1.5,
-        'refresh_frequency': 5,
-        'top_n_pool': 15
-    }
-    generator = MomentumPatternGenerator(config)
-    print(f"✓ Created generator with config: {config}")
-    
-    # Test with sufficient history
-    test_round = 100
-    test_history = history[:test_round]
-    
-    if len(test_history) < config['baseline_window']:
-        print(f"\n✗ Not enough history for test (need {config['baseline_window']}, have {len(test_history)})")
-        return False
-    
-    print(f"\n✓ Testing with {len(test_history)} rounds")
-    
-    # Generate pattern
-    pattern = generator.get_pattern(test_history, test_round)
-    print(f"\n✓ Generated pattern: {pattern}")
-    print(f"  Pattern size: {len(pattern)}")
-    print(f"  All numbers 1-40: {all(1 <= n <= 40 for n in pattern)}")
-    print(f"  No duplicates: {len(pattern) == len(set(pattern))}")
-    
-    # Test momentum calculation for a few numbers
-    print(f"\n✓ Momentum values for sample numbers:")
-    for num in [1, 10, 20, 30, 40]:
-        momentum = generator.calculate_momentum(num, test_history)
-        status = "HOT" if momentum and momentum >= config['momentum_threshold'] else "normal"
-        print(f"  Number {num:2d}: {momentum:.2f} ({status})")
-    
-    # Get all hot numbers
-    hot_numbers = generator.identify_hot_numbers(test_history)
-    print(f"\n✓ Found {len(hot_numbers)} hot numbers (momentum ≥ {config['momentum_threshold']})")
-    if hot_numbers:
-        print(f"  Top 5 hottest:")
-        for item in hot_numbers[:5]:
-            print(f"    {item['number']:2d}: momentum={item['momentum']:.2f}")
-    
-    # Test pattern refresh
-    print(f"\n✓ Testing pattern refresh:")
-    pattern1 = generator.get_pattern(test_history, test_round)
-    pattern2 = generator.get_pattern(test_history, test_round + 1)  # Not refresh time
-    pattern3 = generator.get_pattern(test_history, test_round + 5)  # Refresh time
-    
-    print(f"  Round {test_round}: {pattern1}")
-    print(f"  Round {test_round + 1}: {pattern2} (should be same)")
-    print(f"  Round {test_round + 5}: {pattern3} (should refresh)")
-    print(f"  Pattern persisted: {pattern1 == pattern2}")
-    
-    # Test with minimal history (fallback)
-    print(f"\n✓ Testing fallback with minimal history:")
-    minimal_history = history[:10]
-    fallback_pattern = generator.get_pattern(minimal_history, 10)
-    print(f"  Fallback pattern: {fallback_pattern}")
-    print(f"  Valid pattern: {len(fallback_pattern) == config['pattern_size']}")
-    
-    print(f"\n{'='*60}")
-    print("ALL TESTS PASSED ✓")
-    print(f"{'='*60}\n")
-    
-    return True
+    # Buffer the report and emit it with one write instead of a
+    # syscall per print; the finally flushes early returns and
+    # whatever was logged before an exception
+    out = []
+    try:
+        out.append("="*60)
+        out.append("MOMENTUM GENERATOR - QUICK TEST")
+        out.append("="*60)
+
+        # Load data
+        data_file = Path(__file__).parent.parent / 'data' / 'keno-history-1765519065670.json'
+        if not data_file.exists():
+            out.append(f"Error: Data file not found: {data_file}")
+            return False
+
+        history = attach_round_caches(load_history_streaming(data_file))
+        out.append(f"\n✓ Loaded {len(history)} rounds of history")
+
+        # Create generator
+        config = {
+            'pattern_size': 10,
+            'detection_window': 5,
+            'baseline_window': 50,
+            'momentum_threshold': 1.5,
+            'refresh_frequency': 5,
+            'top_n_pool': 15
+        }
+        generator = MomentumPatternGenerator(config)
+        out.append(f"✓ Created generator with config: {config}")
+
+        # Test with sufficient history
+        test_round = 100
+        test_history = history[:test_round]
+
+        if len(test_history) < config['baseline_window']:
+            out.append(f"\n✗ Not enough history for test (need {config['baseline_window']}, have {len(test_history)})")
+            return False
+
+        out.append(f"\n✓ Testing with {len(test_history)} rounds")
+
+        # Generate pattern
+        pattern = generator.get_pattern(test_history, test_round)
+        out.append(f"\n✓ Generated pattern: {pattern}")
+        out.append(f"  Pattern size: {len(pattern)}")
+        out.append(f"  All numbers 1-40: {all(1 <= n <= 40 for n in pattern)}")
+        out.append(f"  No duplicates: {len(pattern) == len(set(pattern))}")
+
+        # Test momentum calculation for a few numbers
+        out.append(f"\n✓ Momentum values for sample numbers:")
+        for num in [1, 10, 20, 30, 40]:
+            momentum = generator.calculate_momentum(num, test_history)
+            status = "HOT" if momentum and momentum >= config['momentum_threshold'] else "normal"
+            out.append(f"  Number {num:2d}: {momentum:.2f} ({status})")
+
+        # Get all hot numbers
+        hot_numbers, hot_momentum = generator.identify_hot_numbers(test_history)
+        out.append(f"\n✓ Found {len(hot_numbers)} hot numbers (momentum ≥ {config['momentum_threshold']})")
+        if len(hot_numbers):
+            out.append(f"  Top 5 hottest:")
+            for num, momentum in zip(hot_numbers[:5], hot_momentum[:5]):
+                out.append(f"    {num:2d}: momentum={momentum:.2f}")
+
+        # Test pattern refresh
+        out.append(f"\n✓ Testing pattern refresh:")
+        pattern1 = generator.get_pattern(test_history, test_round)
+        pattern2 = generator.get_pattern(test_history, test_round + 1)  # Not refresh time
+        pattern3 = generator.get_pattern(test_history, test_round + 5)  # Refresh time
+
+        out.append(f"  Round {test_round}: {pattern1}")
+        out.append(f"  Round {test_round + 1}: {pattern2} (should be same)")
+        out.append(f"  Round {test_round + 5}: {pattern3} (should refresh)")
+        out.append(f"  Pattern persisted: {pattern1 == pattern2}")
+
+        # Test with minimal history (fallback)
+        out.append(f"\n✓ Testing fallback with minimal history:")
+        minimal_history = history[:10]
+        fallback_pattern = generator.get_pattern(minimal_history, 10)
+        out.append(f"  Fallback pattern: {fallback_pattern}")
+        out.append(f"  Valid pattern: {len(fallback_pattern) == config['pattern_size']}")
+
+        out.append(f"\n{'='*60}")
+        out.append("ALL TESTS PASSED ✓")
+        out.append(f"{'='*60}\n")
+
+        return True
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == '__main__':
     try: